@@ -0,0 +1,129 @@
+import os
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+from ..storage.models import Article
+from .sentiment_analyzer import SentimentAnalyzer
+from .summarizer import TextSummarizer
+from ..scraper.content_extractor import ContentExtractor
+
+# Articles handed to each worker per round-trip
+PROCESS_BATCH_SIZE = 8
+
+# Below this, pool start-up costs more than it saves
+PARALLEL_PROCESS_MIN_ARTICLES = 32
+
+# Workers are started from a multithreaded server (threadpool, scheduler), where
+# a forked child can inherit a lock some other thread was holding
+_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+logger = logging.getLogger('pipeline')
+
+class Processors(NamedTuple):
+    sentiment_analyzer: SentimentAnalyzer
+    summarizer: TextSummarizer
+    content_extractor: ContentExtractor
+
+@lru_cache(maxsize=1)
+def get_processors() -> Processors:
+    """Shared processor instances, built once per process"""
+    return Processors(SentimentAnalyzer(), TextSummarizer(), ContentExtractor())
+
+# ContentExtractor refits its vectorizer on every call, so in-process callers take turns
+_processors_lock = threading.Lock()
+
+def _is_quality(article: Article, content_extractor: ContentExtractor) -> bool:
+    try:
+        return content_extractor.is_quality_content(article.title, article.content)
+    except Exception as e:
+        logger.error(f"Error checking article {article.url}: {e}")
+        return False
+
+def _process_article(article: Article, processors: Processors) -> Optional[Article]:
+    """Fill in a single article; None if any step fails"""
+    try:
+        sentiment_score, sentiment_label = processors.sentiment_analyzer.analyze_sentiment_simple(
+            f"{article.title} {article.content}"
+        )
+        summary = processors.summarizer.summarize(article.content)
+        keywords = processors.content_extractor.extract_keywords(article.content)
+    except Exception as e:
+        logger.error(f"Error processing article {article.url}: {e}")
+        return None
+    
+    article.sentiment_score = sentiment_score
+    article.sentiment_label = sentiment_label
+    article.summary = summary
+    article.keywords = keywords
+    return article
+
+def process_batch(articles: List[Article]) -> List[Article]:
+    """
+    Fill in sentiment, summary and keywords for the quality articles in a
+    batch, dropping the rest; an article that fails is logged and dropped
+    without losing the others
+    """
+    processors = get_processors()
+    sentiment_analyzer, summarizer, content_extractor = processors
+    
+    articles = [article for article in articles if _is_quality(article, content_extractor)]
+    
+    try:
+        sentiments = sentiment_analyzer.batch_analyze_sentiment_simple(
+            [f"{article.title} {article.content}" for article in articles]
+        )
+        summaries = summarizer.batch_summarize([article.content for article in articles])
+    except Exception as e:
+        # Find the culprit by going one article at a time
+        logger.warning(f"Batch processing failed, retrying {len(articles)} articles one by one: {e}")
+        processed = (_process_article(article, processors) for article in articles)
+        return [article for article in processed if article is not None]
+    
+    processed = []
+    for article, (sentiment_score, sentiment_label), summary in zip(articles, sentiments, summaries):
+        try:
+            article.keywords = content_extractor.extract_keywords(article.content)
+        except Exception as e:
+            logger.error(f"Error processing article {article.url}: {e}")
+            continue
+        article.sentiment_score = sentiment_score
+        article.sentiment_label = sentiment_label
+        article.summary = summary
+        processed.append(article)
+    
+    return processed
+
+def process_articles(articles: List[Article], max_workers: Optional[int] = None) -> List[Article]:
+    """Run process_batch over the articles, keeping only quality ones"""
+    if len(articles) < PARALLEL_PROCESS_MIN_ARTICLES:
+        with _processors_lock:
+            return process_batch(articles)
+    
+    # Longest first, so each batch holds similarly sized articles and the
+    # slowest batches start early instead of holding up the tail
+    articles = sorted(articles, key=lambda article: len(article.content or ''), reverse=True)
+    batches = [
+        articles[i:i + PROCESS_BATCH_SIZE]
+        for i in range(0, len(articles), PROCESS_BATCH_SIZE)
+    ]
+    
+    processed = []
+    with ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context(_POOL_START_METHOD)
+    ) as pool:
+        futures = [pool.submit(process_batch, batch) for batch in batches]
+        for batch, future in zip(batches, futures):
+            try:
+                processed.extend(future.result())
+            except Exception as e:
+                # A dead worker (BrokenProcessPool) fails every batch still
+                # pending; redo those here rather than lose the scrape
+                logger.error(f"Worker failed on a batch of {len(batch)} articles, processing in-process: {e}")
+                with _processors_lock:
+                    processed.extend(process_batch(batch))
+    return processed
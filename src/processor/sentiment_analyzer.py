@@ -67,7 +67,12 @@ class SentimentAnalyzer:
         return result['score'], result['label']
     
     def batch_analyze_sentiment(self, texts: list) -> list:
-        results = []
+        # Feeds repeat headlines and boilerplate, so score each distinct text once
+        scored = {}
         for text in texts:
-            results.append(self.analyze_sentiment(text))
-        return results
\ No newline at end of file
+            if text not in scored:
+                scored[text] = self.analyze_sentiment(text)
+        return [dict(scored[text]) for text in texts]
+    
+    def batch_analyze_sentiment_simple(self, texts: list) -> list:
+        return [(result['score'], result['label']) for result in self.batch_analyze_sentiment(texts)]
@@ -23,6 +23,9 @@ class TextSummarizer:
         except Exception:
             return self._simple_summarization(sentences, max_sentences)
     
+    def batch_summarize(self, texts: List[str], max_sentences: int = None) -> List[str]:
+        return [self.summarize(text, max_sentences) for text in texts]
+    
     def _extractive_summarization(self, sentences: List[str], max_sentences: int) -> str:
         if len(sentences) <= max_sentences:
             return ' '.join(sentences)
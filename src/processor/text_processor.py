@@ -1,7 +1,8 @@
 import re
 import nltk
-from typing import List, Dict
+from typing import List, Dict, FrozenSet, Tuple
 from collections import Counter
+from functools import lru_cache
 
 try:
     nltk.data.find('tokenizers/punkt')
@@ -16,14 +17,40 @@ except LookupError:
 from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
 
+# Words common in news copy that carry no topic
+_NEWS_STOP_WORDS = (
+    'said', 'says', 'would', 'could', 'should', 'may', 'might',
+    'according', 'report', 'reports', 'news', 'article', 'story',
+    'clickbait'
+)
+
+@lru_cache(maxsize=1)
+def _load_stop_words() -> FrozenSet[str]:
+    """Read the NLTK stopword corpus once per process, on first use"""
+    return frozenset(stopwords.words('english')).union(_NEWS_STOP_WORDS)
+
+# The summarizer and readability scoring split the same article text, so
+# keep recent results; a module-level function keeps TextProcessor instances
+# out of the cache keys
+@lru_cache(maxsize=1024)
+def _tokenize_sentences(text: str) -> Tuple[str, ...]:
+    try:
+        sentences = sent_tokenize(text)
+        return tuple(s.strip() for s in sentences if len(s.strip()) > 10)
+    except Exception:
+        # Split on sentence endings and preserve them
+        parts = re.split(r'([.!?])', text)
+        sentences = []
+        for i in range(0, len(parts)-1, 2):
+            if i+1 < len(parts):
+                sentence = parts[i].strip() + parts[i+1]
+                if len(sentence.strip()) > 10:
+                    sentences.append(sentence.strip())
+        return tuple(sentences)
+
 class TextProcessor:
     def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
-        self.stop_words.update([
-            'said', 'says', 'would', 'could', 'should', 'may', 'might',
-            'according', 'report', 'reports', 'news', 'article', 'story',
-            'clickbait'
-        ])
+        self.stop_words = _load_stop_words()
     
     def clean_text(self, text: str) -> str:
         text = re.sub(r'<[^>]+>', '', text)
@@ -34,19 +61,8 @@ class TextProcessor:
         return text
     
     def tokenize_sentences(self, text: str) -> List[str]:
-        try:
-            sentences = sent_tokenize(text)
-            return [s.strip() for s in sentences if len(s.strip()) > 10]
-        except Exception:
-            # Split on sentence endings and preserve them
-            parts = re.split(r'([.!?])', text)
-            sentences = []
-            for i in range(0, len(parts)-1, 2):
-                if i+1 < len(parts):
-                    sentence = parts[i].strip() + parts[i+1]
-                    if len(sentence.strip()) > 10:
-                        sentences.append(sentence.strip())
-            return sentences
+        # Copy, so callers can't alter the cached result
+        return list(_tokenize_sentences(text))
     
     def tokenize_words(self, text: str) -> List[str]:
         try:
@@ -131,7 +147,6 @@ class TextProcessor:
         if not words1 or not words2:
             return 0.0
         
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        return len(intersection) / len(union) if union else 0.0
\ No newline at end of file
+        # Jaccard index; the union size follows from the set sizes, so it is never built
+        shared = len(words1 & words2)
+        return shared / (len(words1) + len(words2) - shared)
\ No newline at end of file
@@ -34,6 +34,9 @@ class TrendingTopic:
 class TrendingAnalyzer:
     """Analyzes articles to identify trending topics"""
     
+    # Sample articles kept per topic, enough for the email and CSV exports
+    MAX_RECENT_ARTICLES = 5
+    
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
         self.logger = logging.getLogger('trending_analyzer')
@@ -136,9 +139,9 @@ class TrendingAnalyzer:
                     topic = TrendingTopic(
                         keyword=keyword,
                         frequency=data['count'],
-                        articles_count=len(data['articles']),
+                        articles_count=data['article_count'],
                         avg_sentiment=data['avg_sentiment'],
-                        recent_articles=data['articles'][:5],  # Top 5 most recent
+                        recent_articles=data['articles'],  # Top 5 most recent
                         trend_score=trend_score
                     )
                     trending_topics.append(topic)
@@ -152,12 +155,12 @@ class TrendingAnalyzer:
             return []
     
     def _get_recent_articles(self, cutoff_time: datetime) -> List[Dict[str, Any]]:
-        """Get articles published after cutoff_time"""
+        """Get articles published after cutoff_time, newest first, with content cut to 500 chars"""
         with self.db_manager.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT id, title, content, source, published_date, scraped_date,
-                       sentiment_score, sentiment_label, keywords
+                SELECT id, title, substr(content, 1, 500) AS content, source,
+                       published_date, scraped_date, sentiment_score, sentiment_label, keywords
                 FROM articles 
                 WHERE scraped_date >= ? 
                 ORDER BY scraped_date DESC
@@ -180,43 +183,47 @@ class TrendingAnalyzer:
             return articles
     
     def _extract_keywords_from_articles(self, articles: List[Dict[str, Any]]) -> Dict[str, Dict]:
-        """Extract and analyze keywords from articles"""
+        """Extract and analyze keywords from articles (expects articles newest first)"""
         keyword_data = defaultdict(lambda: {
             'count': 0,
+            'article_count': 0,
             'articles': [],
-            'sentiments': [],
-            'timestamps': []
+            'sentiment_total': 0.0,
+            'recency_total': 0.0
         })
         
         for article in articles:
             # Extract keywords from title (weighted more heavily)
             title_keywords = self._extract_keywords(article['title'], weight=2)
-            content_keywords = self._extract_keywords(article['content'][:500])  # First 500 chars
+            content_keywords = self._extract_keywords(article['content'])  # Already cut to 500 chars
             
             # Combine keywords
             all_keywords = title_keywords + content_keywords
+            recency_score = self._calculate_recency_score([article['scraped_date']])
             
             # Update keyword data
             for keyword in set(all_keywords):  # Remove duplicates within article
-                keyword_data[keyword]['count'] += all_keywords.count(keyword)
-                keyword_data[keyword]['articles'].append({
-                    'id': article['id'],
-                    'title': article['title'],
-                    'source': article['source'],
-                    'sentiment': article['sentiment_label'],
-                    'scraped_date': article['scraped_date']
-                })
-                keyword_data[keyword]['sentiments'].append(article['sentiment_score'])
-                keyword_data[keyword]['timestamps'].append(article['scraped_date'])
+                data = keyword_data[keyword]
+                data['count'] += all_keywords.count(keyword)
+                data['article_count'] += 1
+                data['sentiment_total'] += article['sentiment_score']
+                data['recency_total'] += recency_score
+                
+                # Articles arrive newest first, so only the first few per keyword are kept
+                if len(data['articles']) < self.MAX_RECENT_ARTICLES:
+                    data['articles'].append({
+                        'id': article['id'],
+                        'title': article['title'],
+                        'source': article['source'],
+                        'sentiment': article['sentiment_label'],
+                        'scraped_date': article['scraped_date']
+                    })
         
         # Calculate aggregated metrics
         for keyword, data in keyword_data.items():
-            data['total_articles'] = len(set(a['id'] for a in data['articles']))
-            data['avg_sentiment'] = sum(data['sentiments']) / len(data['sentiments']) if data['sentiments'] else 0
-            data['recency_score'] = self._calculate_recency_score(data['timestamps'])
-            
-            # Sort articles by recency
-            data['articles'].sort(key=lambda x: x['scraped_date'], reverse=True)
+            data['total_articles'] = data['article_count']
+            data['avg_sentiment'] = data['sentiment_total'] / data['article_count']
+            data['recency_score'] = data['recency_total'] / data['article_count']
         
         return dict(keyword_data)
     
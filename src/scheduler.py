@@ -6,9 +6,7 @@ from typing import Dict, Any
 
 from .storage.database import DatabaseManager
 from .scraper.news_sources import NewsSourceManager
-from .processor.sentiment_analyzer import SentimentAnalyzer
-from .processor.summarizer import TextSummarizer
-from .scraper.content_extractor import ContentExtractor
+from .processor.pipeline import process_articles
 from .utils.config import Config
 from .utils.email_service import EmailNotificationService, EmailConfig, EmailRecipient
 
@@ -27,10 +25,6 @@ class NewsScheduler:
         for source_config in config.get_sources():
             self.news_manager.add_source(source_config)
         
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.summarizer = TextSummarizer()
-        self.content_extractor = ContentExtractor()
-        
         # Initialize email service if enabled
         self.email_service = None
         self._setup_email_service()
@@ -123,44 +117,24 @@ class NewsScheduler:
         self.logger.info(f"Scheduled scraping every {scrape_interval} hours")
         self.logger.info(f"Scheduled cleanup every {cleanup_interval} hours")
     
-    async def scrape_all_sources(self):
+    def scrape_all_sources(self):
+        # Scraping, processing and the bulk insert all block (and processing
+        # waits on a lock /api/scrape may hold), so this stays a plain function
+        # that AsyncIOScheduler runs in its thread pool, off the event loop
         self.logger.info("Starting scheduled scraping of all sources")
         try:
             start_time = datetime.now()
             
             all_results = self.news_manager.scrape_all_sources()
             
-            total_scraped = 0
-            total_processed = 0
-            
-            for source_name, articles in all_results.items():
-                total_scraped += len(articles)
-    
-                for article in articles:
-                    try:
-                        if self.content_extractor.is_quality_content(article.title, article.content):
-                            sentiment_score, sentiment_label = self.sentiment_analyzer.analyze_sentiment_simple(
-                                f"{article.title} {article.content}"
-                            )
-                            article.sentiment_score = sentiment_score
-                            article.sentiment_label = sentiment_label
-                            
-                            article.summary = self.summarizer.summarize(article.content)
-                            article.keywords = self.content_extractor.extract_keywords(article.content)
-                            
-                            if self.db_manager.add_article(article):
-                                total_processed += 1
-                                self.db_manager.update_source_stats(source_name, True)
-                            else:
-                                self.db_manager.update_source_stats(source_name, False)
-                    except Exception as e:
-                        self.logger.error(f"Error processing article from {source_name}: {e}")
-                        self.db_manager.update_source_stats(source_name, False)
+            # One processing pass (and so one worker pool) for the whole scrape
+            articles = [article for source_articles in all_results.values() for article in source_articles]
+            total_processed = self.db_manager.add_articles_bulk(process_articles(articles))
             
             duration = datetime.now() - start_time
             self.logger.info(
                 f"Scraping completed in {duration.total_seconds():.1f}s. "
-                f"Scraped: {total_scraped}, Processed: {total_processed}"
+                f"Scraped: {len(articles)}, Processed: {total_processed}"
             )
             
         except Exception as e:
@@ -6,9 +6,46 @@ from datetime import datetime
 from typing import List, Dict, Optional, Any
 from urllib.parse import urljoin, urlparse
 import re
+import soupsieve as sv
 
 from ..storage.models import Article
 
+# Selector used for each field when the source config doesn't give one
+DEFAULT_SELECTORS = {
+    'article_links': 'a',
+    'title': 'h1',
+    'content': 'p',
+    'date': 'time',
+}
+
+# Sites with consistent domains, where only same-domain links are articles
+_SAME_DOMAIN_SITES = frozenset({
+    'www.bbc.com', 'www.theguardian.com', 'www.npr.org', 'apnews.com',
+    'www.sciencedaily.com', 'www.livescience.com',
+    'techcrunch.com', 'arstechnica.com', 'www.engadget.com'
+})
+
+# Links to these are never articles
+_NON_ARTICLE_URL_RE = re.compile(
+    r'/video/|/gallery/|/live/|/sport/|/podcast/|'
+    r'#|javascript:|mailto:|tel:|/tag/|/author/|'
+    r'/category/|/search/|/subscribe|/newsletter',
+    re.IGNORECASE
+)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_ADVERTISEMENT_RE = re.compile(r'^\s*Advertisement\s*', re.IGNORECASE)
+_SHARE_THIS_RE = re.compile(r'^\s*Share this.*?\s*', re.IGNORECASE)
+_DATE_NOISE_RE = re.compile(r'[^\w\s:+-]')
+
+# Tried in order; the first one that matches wins
+_AUTHOR_SELECTORS = [
+    sv.compile(selector) for selector in (
+        '.author', '.byline', '[rel="author"]',
+        '.article-author', '.post-author'
+    )
+]
+
 class BaseScraper:
     def __init__(self, source_config: Dict[str, Any], scraping_config: Dict[str, Any]):
         self.source_config = source_config
@@ -33,6 +70,20 @@ class BaseScraper:
         self.min_content_length = scraping_config.get('min_content_length', 100)
         
         self.logger = logging.getLogger(f'scraper.{self.source_name}')
+        
+        # Parsed once here instead of on every select() over every page
+        self._compiled_selectors = {
+            field: self._compile_selector(field, default)
+            for field, default in DEFAULT_SELECTORS.items()
+        }
+    
+    def _compile_selector(self, field: str, default: str) -> sv.SoupSieve:
+        selector = self.selectors.get(field, default)
+        try:
+            return sv.compile(selector)
+        except sv.SelectorSyntaxError as e:
+            self.logger.error(f"Invalid {field} selector {selector!r}, using {default!r}: {e}")
+            return sv.compile(default)
     
     def fetch_page(self, url: str) -> Optional[BeautifulSoup]:
         for attempt in range(self.retry_attempts):
@@ -40,7 +91,7 @@ class BaseScraper:
                 response = self.session.get(url, timeout=self.timeout)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml')
                 return soup
                 
             except Exception as e:
@@ -54,11 +105,10 @@ class BaseScraper:
     
     def extract_article_links(self, soup: BeautifulSoup) -> List[str]:
         links = []
-        link_selector = self.selectors.get('article_links', 'a')
         
         try:
-            elements = soup.select(link_selector)
-            for element in elements[:self.max_articles]:
+            elements = self._compiled_selectors['article_links'].select(soup, limit=self.max_articles)
+            for element in elements:
                 href = element.get('href')
                 if href:
                     full_url = urljoin(self.base_url, href)
@@ -80,24 +130,12 @@ class BaseScraper:
             url_domain = parsed.netloc.lower()
             
             # For sites that have consistent domains - only allow same-domain links
-            allowed_domains = [
-                'www.bbc.com', 'www.theguardian.com', 'www.npr.org', 'apnews.com',
-                'www.sciencedaily.com', 'www.livescience.com',
-                'techcrunch.com', 'arstechnica.com', 'www.engadget.com'
-            ]
-            if base_domain in allowed_domains:
+            if base_domain in _SAME_DOMAIN_SITES:
                 if url_domain != base_domain:
                     return False
             
-            invalid_patterns = [
-                r'/video/', r'/gallery/', r'/live/', r'/sport/', r'/podcast/',
-                r'#', r'javascript:', r'mailto:', r'tel:', r'/tag/', r'/author/',
-                r'/category/', r'/search/', r'/subscribe', r'/newsletter'
-            ]
-            
-            for pattern in invalid_patterns:
-                if re.search(pattern, url, re.IGNORECASE):
-                    return False
+            if _NON_ARTICLE_URL_RE.search(url):
+                return False
             
             return True
         except Exception:
@@ -134,9 +172,8 @@ class BaseScraper:
             return None
     
     def _extract_title(self, soup: BeautifulSoup) -> str:
-        title_selector = self.selectors.get('title', 'h1')
         try:
-            title_element = soup.select_one(title_selector)
+            title_element = self._compiled_selectors['title'].select_one(soup)
             if title_element:
                 return title_element.get_text(strip=True)
             
@@ -149,11 +186,10 @@ class BaseScraper:
         return ""
     
     def _extract_content(self, soup: BeautifulSoup) -> str:
-        content_selector = self.selectors.get('content', 'p')
         content_parts = []
         
         try:
-            elements = soup.select(content_selector)
+            elements = self._compiled_selectors['content'].select(soup)
             for element in elements:
                 text = element.get_text(strip=True)
                 if text and len(text) > 20:
@@ -172,10 +208,8 @@ class BaseScraper:
         return self._clean_content(content)
     
     def _extract_date(self, soup: BeautifulSoup) -> Optional[datetime]:
-        date_selector = self.selectors.get('date', 'time')
-        
         try:
-            date_element = soup.select_one(date_selector)
+            date_element = self._compiled_selectors['date'].select_one(soup)
             if date_element:
                 datetime_attr = date_element.get('datetime')
                 if datetime_attr:
@@ -190,14 +224,9 @@ class BaseScraper:
         return None
     
     def _extract_author(self, soup: BeautifulSoup) -> str:
-        author_selectors = [
-            '.author', '.byline', '[rel="author"]',
-            '.article-author', '.post-author'
-        ]
-        
         try:
-            for selector in author_selectors:
-                author_element = soup.select_one(selector)
+            for selector in _AUTHOR_SELECTORS:
+                author_element = selector.select_one(soup)
                 if author_element:
                     return author_element.get_text(strip=True)
         except Exception as e:
@@ -206,6 +235,13 @@ class BaseScraper:
         return ""
     
     def _parse_date(self, date_str: str) -> Optional[datetime]:
+        # Most pages give an ISO 8601 <time datetime>, which fromisoformat
+        # handles directly (including 'Z' and fractional seconds)
+        try:
+            return datetime.fromisoformat(date_str.strip())
+        except ValueError:
+            pass
+        
         date_formats = [
             '%Y-%m-%dT%H:%M:%S%z',
             '%Y-%m-%dT%H:%M:%SZ',
@@ -215,7 +251,7 @@ class BaseScraper:
             '%B %d, %Y',
         ]
         
-        date_str = re.sub(r'[^\w\s:+-]', ' ', date_str).strip()
+        date_str = _DATE_NOISE_RE.sub(' ', date_str).strip()
         
         for fmt in date_formats:
             try:
@@ -226,9 +262,9 @@ class BaseScraper:
         return None
     
     def _clean_content(self, content: str) -> str:
-        content = re.sub(r'\s+', ' ', content)
-        content = re.sub(r'^\s*Advertisement\s*', '', content, flags=re.IGNORECASE)
-        content = re.sub(r'^\s*Share this.*?\s*', '', content, flags=re.IGNORECASE)
+        content = _WHITESPACE_RE.sub(' ', content)
+        content = _ADVERTISEMENT_RE.sub('', content)
+        content = _SHARE_THIS_RE.sub('', content)
         content = content.strip()
         return content
     
@@ -1,8 +1,20 @@
 import re
+from collections import Counter
 from typing import List, Set
 from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
 from sklearn.metrics.pairwise import cosine_similarity
 
+# Filler words skipped by the frequency-based keyword fallback
+_FALLBACK_STOP_WORDS = frozenset({
+    'this', 'that', 'with', 'have', 'will', 'from', 'they', 'been',
+    'were', 'said', 'each', 'which', 'their', 'time', 'would', 'there',
+    'could', 'other', 'more', 'very', 'what', 'know', 'just', 'first',
+    'get', 'over', 'think', 'also', 'back', 'after', 'use', 'two',
+    'how', 'our', 'work', 'life', 'only', 'can', 'still', 'should',
+    'must', 'want', 'need', 'make', 'take', 'come', 'year', 'years'
+})
+
 class ContentExtractor:
     def __init__(self, duplicate_threshold: float = 0.8):
         self.duplicate_threshold = duplicate_threshold
@@ -35,23 +47,10 @@ class ContentExtractor:
     def _extract_keywords_fallback(self, text: str, max_keywords: int) -> str:
         words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
         
-        stop_words = {
-            'this', 'that', 'with', 'have', 'will', 'from', 'they', 'been', 
-            'were', 'said', 'each', 'which', 'their', 'time', 'would', 'there',
-            'could', 'other', 'more', 'very', 'what', 'know', 'just', 'first',
-            'get', 'over', 'think', 'also', 'back', 'after', 'use', 'two',
-            'how', 'our', 'work', 'life', 'only', 'can', 'still', 'should',
-            'must', 'want', 'need', 'make', 'take', 'come', 'year', 'years'
-        }
-        
-        filtered_words = [word for word in words if word not in stop_words]
-        
-        word_freq = {}
-        for word in filtered_words:
-            word_freq[word] = word_freq.get(word, 0) + 1
+        filtered_words = [word for word in words if word not in _FALLBACK_STOP_WORDS]
         
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        keywords = [word[0] for word in sorted_words[:max_keywords]]
+        word_freq = Counter(filtered_words)
+        keywords = [word for word, _ in word_freq.most_common(max_keywords)]
         
         return ", ".join(keywords)
     
@@ -69,7 +68,10 @@ class ContentExtractor:
         
         try:
             tfidf_matrix = self.vectorizer.fit_transform(articles)
-            similarity_matrix = cosine_similarity(tfidf_matrix)
+            # Keep the similarities sparse and walk only the pairs over the
+            # threshold, rather than every cell of a dense n x n matrix
+            similarity_matrix = cosine_similarity(tfidf_matrix, dense_output=False)
+            above_threshold = sparse.triu(similarity_matrix >= self.duplicate_threshold, k=1).tocsr()
             
             duplicates = []
             processed = set()
@@ -78,14 +80,9 @@ class ContentExtractor:
                 if i in processed:
                     continue
                 
+                row = above_threshold.indices[above_threshold.indptr[i]:above_threshold.indptr[i + 1]]
                 duplicate_group = {i}
-                for j in range(i + 1, len(articles)):
-                    if j in processed:
-                        continue
-                    
-                    if similarity_matrix[i][j] >= self.duplicate_threshold:
-                        duplicate_group.add(j)
-                        processed.add(j)
+                duplicate_group.update(int(j) for j in row if j not in processed)
                 
                 if len(duplicate_group) > 1:
                     duplicates.append(duplicate_group)
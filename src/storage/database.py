@@ -1,21 +1,94 @@
 import sqlite3
 import os
+import threading
+import uuid
+import weakref
+from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 from contextlib import contextmanager
+from collections import Counter
 
 from .models import Article, Source
 
+# Timestamps are stored as 'YYYY-MM-DD HH:MM:SS', so swapping the
+# separator yields the same string datetime.isoformat() would
+_ARTICLE_LIST_COLUMNS = (
+    "id, title, summary, url, source, "
+    "replace(published_date, ' ', 'T') AS published_date, "
+    "replace(scraped_date, ' ', 'T') AS scraped_date, "
+    "sentiment_score, sentiment_label, category, keywords, author"
+)
+_ARTICLE_SEARCH_COLUMNS = (
+    "id, title, summary, url, source, "
+    "replace(published_date, ' ', 'T') AS published_date, "
+    "sentiment_score, sentiment_label, keywords"
+)
+
+# Most recent FTS matches considered for ranking per search
+SEARCH_CANDIDATE_LIMIT = 500
+
+# Prepared statements kept per pooled connection, so the data, analytics and
+# export queries can all stay parsed on a long-lived connection (default 128)
+STATEMENT_CACHE_SIZE = 256
+
+class _ThreadConnection:
+    """Holds a thread's pooled connection; it goes away with the thread"""
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+def _release_connection(conn: sqlite3.Connection, connections: Set[sqlite3.Connection],
+                        lock: threading.Lock):
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
+def _fts_match_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query: each whitespace-separated term is
+    quoted (so dots, dashes and operators are taken literally) and
+    prefix-matched, and all terms must match
+    """
+    terms = query.split()
+    return ' '.join('"' + term.replace('"', '""') + '"*' for term in terms)
+
 class DatabaseManager:
     def __init__(self, db_path: str):
         self.db_path = db_path
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        
+        # Every pooled connection to a plain ':memory:' path would get its own
+        # empty database, so use a named shared-cache one instead; it lives
+        # until close() drops the last connection to it
+        self._memory_uri = None
+        if db_path == ':memory:':
+            self._memory_uri = f"file:daily-digest-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        elif os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        
+        # One connection per thread, reused across calls; all of them are
+        # tracked so close() can reach handles opened by other threads, and
+        # each is closed when its thread exits (threadpool workers come and go)
+        self._local = threading.local()
+        self._connections: Set[sqlite3.Connection] = set()
+        self._connections_lock = threading.Lock()
+        
+        # Thread connections close as their threads exit, so hold one that
+        # doesn't to keep a shared in-memory database alive until close()
+        if self._memory_uri:
+            self._connections.add(self._connect())
+        
         self._init_database()
     
     def _init_database(self):
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
+            # WAL lets the web readers keep going while a scrape writes; the
+            # mode is stored in the database file, so setting it once is enough
+            cursor.execute('PRAGMA journal_mode = WAL')
+            
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS sources (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -53,13 +126,226 @@ class DatabaseManager:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_date)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_scraped ON articles(scraped_date)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_url ON articles(url)')
+            # Source-filtered article listings, newest first
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_source_scraped ON articles(source, scraped_date DESC)')
+            # Covers the sentiment distribution GROUP BY
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_sentiment_label ON articles(sentiment_label)')
+            
+            self._init_article_count(cursor)
+            self._init_source_daily_stats(cursor)
+            self._init_articles_fts(cursor)
+            
+            # Give the planner statistics to choose between the indices above
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                cursor.execute('ANALYZE')
             
             conn.commit()
     
+    def _init_article_count(self, cursor: sqlite3.Cursor):
+        """
+        Running article total, kept current by triggers so counting doesn't
+        walk the whole articles table
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS table_counts (
+                name TEXT PRIMARY KEY,
+                row_count INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        # Only seeds the row when it's missing; from then on the triggers own it
+        cursor.execute('''
+            INSERT OR IGNORE INTO table_counts (name, row_count)
+            SELECT 'articles', COUNT(*) FROM articles
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_articles_count_insert
+            AFTER INSERT ON articles BEGIN
+                UPDATE table_counts SET row_count = row_count + 1 WHERE name = 'articles';
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_articles_count_delete
+            AFTER DELETE ON articles BEGIN
+                UPDATE table_counts SET row_count = row_count - 1 WHERE name = 'articles';
+            END
+        ''')
+    
+    def _init_source_daily_stats(self, cursor: sqlite3.Cursor):
+        """
+        Per-source, per-day article counts and sentiment totals, kept current
+        by triggers so analytics can skip the full articles scan
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'source_daily_stats'"
+        )
+        needs_backfill = cursor.fetchone() is None
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS source_daily_stats (
+                source TEXT NOT NULL,
+                day TEXT NOT NULL,
+                article_count INTEGER NOT NULL DEFAULT 0,
+                sentiment_count INTEGER NOT NULL DEFAULT 0,
+                sentiment_total REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (source, day)
+            )
+        ''')
+        
+        if needs_backfill:
+            cursor.execute('''
+                INSERT INTO source_daily_stats
+                (source, day, article_count, sentiment_count, sentiment_total)
+                SELECT source, COALESCE(date(scraped_date), ''), COUNT(*),
+                       COUNT(sentiment_score), COALESCE(SUM(sentiment_score), 0)
+                FROM articles
+                GROUP BY 1, 2
+            ''')
+        
+        add_new = '''
+            INSERT INTO source_daily_stats
+            (source, day, article_count, sentiment_count, sentiment_total)
+            VALUES (NEW.source, COALESCE(date(NEW.scraped_date), ''), 1,
+                    NEW.sentiment_score IS NOT NULL, COALESCE(NEW.sentiment_score, 0))
+            ON CONFLICT (source, day) DO UPDATE SET
+                article_count = article_count + 1,
+                sentiment_count = sentiment_count + excluded.sentiment_count,
+                sentiment_total = sentiment_total + excluded.sentiment_total;
+        '''
+        remove_old = '''
+            UPDATE source_daily_stats SET
+                article_count = article_count - 1,
+                sentiment_count = sentiment_count - (OLD.sentiment_score IS NOT NULL),
+                sentiment_total = sentiment_total - COALESCE(OLD.sentiment_score, 0)
+            WHERE source = OLD.source AND day = COALESCE(date(OLD.scraped_date), '');
+            DELETE FROM source_daily_stats
+            WHERE source = OLD.source AND day = COALESCE(date(OLD.scraped_date), '')
+            AND article_count <= 0;
+        '''
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_articles_stats_insert
+            AFTER INSERT ON articles BEGIN {add_new} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_articles_stats_delete
+            AFTER DELETE ON articles BEGIN {remove_old} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_articles_stats_update
+            AFTER UPDATE OF source, scraped_date, sentiment_score ON articles
+            BEGIN {remove_old} {add_new} END
+        ''')
+    
+    def _init_articles_fts(self, cursor: sqlite3.Cursor):
+        """
+        FTS5 index over article text, kept in sync with articles by triggers;
+        search falls back to LIKE scans when SQLite lacks FTS5
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+        )
+        needs_backfill = cursor.fetchone() is None
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    title, summary, content, keywords,
+                    content='articles', content_rowid='id'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            self.fts_enabled = False
+            return
+        self.fts_enabled = True
+        
+        if needs_backfill:
+            cursor.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+        
+        add_new = '''
+            INSERT INTO articles_fts (rowid, title, summary, content, keywords)
+            VALUES (NEW.id, NEW.title, NEW.summary, NEW.content, NEW.keywords);
+        '''
+        remove_old = '''
+            INSERT INTO articles_fts (articles_fts, rowid, title, summary, content, keywords)
+            VALUES ('delete', OLD.id, OLD.title, OLD.summary, OLD.content, OLD.keywords);
+        '''
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_articles_fts_insert
+            AFTER INSERT ON articles BEGIN {add_new} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_articles_fts_delete
+            AFTER DELETE ON articles BEGIN {remove_old} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_articles_fts_update
+            AFTER UPDATE OF title, summary, content, keywords ON articles
+            BEGIN {remove_old} {add_new} END
+        ''')
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._memory_uri:
+            conn = sqlite3.connect(
+                self._memory_uri, uri=True, check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+            )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute('PRAGMA cache_size = -65536')
+        conn.execute('PRAGMA mmap_size = 268435456')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA busy_timeout = 5000')
+        return conn
+    
     @contextmanager
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = self._local.holder = _ThreadConnection(self._connect())
+            with self._connections_lock:
+                self._connections.add(holder.conn)
+            # The thread's locals are dropped when it exits, taking the holder with them
+            weakref.finalize(
+                holder, _release_connection, holder.conn, self._connections, self._connections_lock
+            )
+        conn = holder.conn
+        try:
+            yield conn
+        finally:
+            # Drop anything left uncommitted, as closing the connection used to
+            if conn.in_transaction:
+                conn.rollback()
+    
+    def close(self):
+        """Close every pooled connection; later calls open fresh ones"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+    
+    @contextmanager
+    def get_readonly_connection(self):
+        """Read-only connection for long scans (exports), with its own larger page cache"""
+        if self._memory_uri:
+            # mode=ro can't open an in-memory database, so share it and refuse writes instead
+            uri = self._memory_uri
+        else:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro&cache=private"
+        # Streamed exports resume their generator on whichever worker thread
+        # is free, though only one thread uses the connection at a time
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        if self._memory_uri:
+            conn.execute('PRAGMA query_only = ON')
+        conn.execute('PRAGMA cache_size = -65536')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA mmap_size = 268435456')
         try:
             yield conn
         finally:
@@ -98,20 +384,25 @@ class DatabaseManager:
             ) for row in rows]
     
     def update_source_stats(self, source_name: str, success: bool):
+        if success:
+            self.bump_source_stats(source_name, success_delta=1)
+        else:
+            self.bump_source_stats(source_name, error_delta=1)
+    
+    def bump_source_stats(self, source_name: str, success_delta: int = 0, error_delta: int = 0):
+        """
+        Add to a source's success/error counts in one statement; last_scraped
+        moves only when there were successes. Unknown sources are ignored.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            if success:
-                cursor.execute('''
-                    UPDATE sources 
-                    SET success_count = success_count + 1, last_scraped = ?
-                    WHERE name = ?
-                ''', (datetime.now(), source_name))
-            else:
-                cursor.execute('''
-                    UPDATE sources 
-                    SET error_count = error_count + 1
-                    WHERE name = ?
-                ''', (source_name,))
+            cursor.execute('''
+                UPDATE sources 
+                SET success_count = success_count + ?,
+                    error_count = error_count + ?,
+                    last_scraped = CASE WHEN ? > 0 THEN ? ELSE last_scraped END
+                WHERE name = ?
+            ''', (success_delta, error_delta, success_delta, datetime.now(), source_name))
             conn.commit()
     
     def add_article(self, article: Article) -> Optional[int]:
@@ -133,6 +424,89 @@ class DatabaseManager:
         except sqlite3.IntegrityError:
             return None
     
+    def add_articles_bulk(self, articles: List[Article]) -> int:
+        """
+        Insert articles in one transaction, skipping ones that fail constraints
+        (e.g. duplicate URLs), and record per-source success/error counts.
+        Inserted articles get their new id set on the Article.
+        
+        Returns:
+            Number of articles inserted
+        """
+        if not articles:
+            return 0
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # Take the write lock before reading the baseline; sqlite3 only
+            # opens its implicit transaction at the INSERT, so another writer
+            # could commit rows in between that we'd then count as ours
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('SELECT COALESCE(MAX(id), 0) FROM articles')
+            last_id = cursor.fetchone()[0]
+            
+            cursor.executemany('''
+                INSERT OR IGNORE INTO articles 
+                (title, content, summary, url, source, published_date, 
+                 sentiment_score, sentiment_label, category, keywords, author)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(
+                article.title, article.content, article.summary, article.url,
+                article.source, article.published_date, article.sentiment_score,
+                article.sentiment_label, article.category, article.keywords, article.author
+            ) for article in articles])
+            
+            # AUTOINCREMENT ids only grow, so anything past last_id was inserted just now
+            cursor.execute('SELECT id, url, source FROM articles WHERE id > ?', (last_id,))
+            inserted_ids = {}
+            inserted = Counter()
+            for article_id, url, source in cursor.fetchall():
+                inserted_ids[url] = article_id
+                inserted[source] += 1
+            # pop, so a repeated URL in the batch leaves the skipped copy's id alone
+            for article in articles:
+                article.id = inserted_ids.pop(article.url, article.id)
+            
+            submitted = Counter(article.source for article in articles)
+            now = datetime.now()
+            cursor.executemany('''
+                UPDATE sources 
+                SET success_count = success_count + ?,
+                    error_count = error_count + ?,
+                    last_scraped = CASE WHEN ? > 0 THEN ? ELSE last_scraped END
+                WHERE name = ?
+            ''', [
+                (inserted[source], max(count - inserted[source], 0), inserted[source], now, source)
+                for source, count in submitted.items()
+            ])
+            
+            conn.commit()
+            
+            # Refresh planner statistics if this batch shifted them
+            cursor.execute('PRAGMA optimize')
+            return sum(inserted.values())
+    
+    def set_scraped_date(self, article_ids: List[int], scraped_date: datetime) -> int:
+        """
+        Re-date articles, e.g. when importing an archive; the stats triggers
+        move them to the right day
+        
+        Returns:
+            Number of articles updated
+        """
+        if not article_ids:
+            return 0
+        
+        placeholders = ', '.join('?' * len(article_ids))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f'UPDATE articles SET scraped_date = ? WHERE id IN ({placeholders})',
+                (scraped_date, *article_ids)
+            )
+            conn.commit()
+            return cursor.rowcount
+    
     def get_articles(self, limit: int = 50, offset: int = 0, source: Optional[str] = None) -> List[Article]:
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -165,6 +539,23 @@ class DatabaseManager:
                 author=row['author']
             ) for row in rows]
     
+    def get_articles_raw(self, limit: int = 50, offset: int = 0, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Same rows as get_articles, projected straight into API-shaped dicts with ISO dates"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            query = f"SELECT {_ARTICLE_LIST_COLUMNS} FROM articles"
+            params = []
+            
+            if source:
+                query += " WHERE source = ?"
+                params.append(source)
+            
+            query += " ORDER BY scraped_date DESC LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+            
+            cursor.execute(query, params)
+            return list(map(dict, cursor.fetchall()))
+    
     def get_article_by_id(self, article_id: int) -> Optional[Article]:
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -189,17 +580,37 @@ class DatabaseManager:
                 )
             return None
     
-    def search_articles(self, query: str, limit: int = 50) -> List[Article]:
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+    def _search(self, cursor: sqlite3.Cursor, columns: str, query: str, limit: int):
+        """Run a search selecting the given article columns; best FTS matches first"""
+        if not self.fts_enabled:
             search_query = f"%{query}%"
-            cursor.execute('''
-                SELECT * FROM articles 
+            cursor.execute(f'''
+                SELECT {columns} FROM articles 
                 WHERE title LIKE ? OR content LIKE ? OR keywords LIKE ?
                 ORDER BY scraped_date DESC LIMIT ?
             ''', (search_query, search_query, search_query, limit))
-            
-            rows = cursor.fetchall()
+            return cursor.fetchall()
+        
+        match_query = _fts_match_query(query)
+        if not match_query:
+            return []
+        
+        # Only the newest matches are ranked, so the bm25 cost stays bounded
+        # however many articles a common term hits
+        cursor.execute(f'''
+            SELECT {columns} FROM articles
+            JOIN (
+                SELECT rowid, rank FROM articles_fts WHERE articles_fts MATCH ?
+                ORDER BY rowid DESC LIMIT ?
+            ) AS matches ON matches.rowid = articles.id
+            ORDER BY matches.rank LIMIT ?
+        ''', (match_query, SEARCH_CANDIDATE_LIMIT, limit))
+        return cursor.fetchall()
+    
+    def search_articles(self, query: str, limit: int = 50) -> List[Article]:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            rows = self._search(cursor, "articles.*", query, limit)
             return [Article(
                 id=row['id'],
                 title=row['title'],
@@ -216,6 +627,12 @@ class DatabaseManager:
                 author=row['author']
             ) for row in rows]
     
+    def search_articles_raw(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Same rows as search_articles, projected straight into API-shaped dicts with ISO dates"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            return list(map(dict, self._search(cursor, _ARTICLE_SEARCH_COLUMNS, query, limit)))
+    
     def cleanup_old_articles(self, retention_days: int):
         cutoff_date = datetime.now() - timedelta(days=retention_days)
         with self.get_connection() as conn:
@@ -228,9 +645,23 @@ class DatabaseManager:
     def get_article_count(self) -> int:
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM articles')
+            cursor.execute("SELECT row_count FROM table_counts WHERE name = 'articles'")
             return cursor.fetchone()[0]
     
+    def get_data_version(self) -> str:
+        """
+        Cheap token that changes whenever articles are added or cleaned up:
+        ids are AUTOINCREMENT, so the (MIN, MAX) rowid pair moves on every
+        insert and every retention cleanup
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT (SELECT MIN(rowid) FROM articles), (SELECT MAX(rowid) FROM articles)'
+            )
+            min_id, max_id = cursor.fetchone()
+            return f"{min_id or 0}.{max_id or 0}"
+    
     def get_sentiment_distribution(self) -> Dict[str, int]:
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -242,6 +673,28 @@ class DatabaseManager:
             ''')
             return dict(cursor.fetchall())
     
+    def get_sentiment_summary(self) -> Tuple[Dict[str, int], int]:
+        """
+        Sentiment distribution and total article count from a single pass
+        over the sentiment_label index
+        
+        Returns:
+            (distribution, total_articles), matching get_sentiment_distribution
+            and get_article_count
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT sentiment_label, COUNT(*) as count 
+                FROM articles 
+                GROUP BY sentiment_label
+            ''')
+            counts = dict(cursor.fetchall())
+            
+            total_articles = sum(counts.values())
+            counts.pop(None, None)
+            return counts, total_articles
+    
     def get_trending_keywords(self, limit: int = 10) -> List[Dict[str, Any]]:
         with self.get_connection() as conn:
             cursor = conn.cursor()
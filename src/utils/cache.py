@@ -0,0 +1,40 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class TTLCache:
+    """Small in-process cache whose entries expire after a fixed time-to-live"""
+    
+    def __init__(self, ttl: timedelta, maxsize: int = 32):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[datetime, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Return the cached value for key, computing and storing it on a miss
+        
+        Returns:
+            (value, hit) where hit is True if the value came from the cache
+        """
+        now = datetime.now()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                return entry[1], True
+        
+        value = compute()
+        
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                # Evict the oldest entry
+                oldest_key = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest_key]
+            self._entries[key] = (now, value)
+        
+        return value, False
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -10,13 +10,14 @@ from email.mime.base import MIMEBase
 from email import encoders
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 import aiosmtplib
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 import os
 
 from ..processor.trending_analyzer import TrendingAnalyzer
 from ..storage.database import DatabaseManager
+from .cache import TTLCache
 
 
 @dataclass
@@ -43,6 +44,9 @@ class EmailRecipient:
 class EmailNotificationService:
     """Service for sending email notifications"""
     
+    # SMTP sessions open at once during a bulk send
+    MAX_CONCURRENT_SENDS = 10
+    
     def __init__(self, email_config: EmailConfig, db_manager: DatabaseManager, 
                  templates_dir: str = "src/web/templates"):
         self.config = email_config
@@ -58,6 +62,9 @@ class EmailNotificationService:
         
         # Initialize trending analyzer
         self.trending_analyzer = TrendingAnalyzer(db_manager)
+        
+        # Status checks only need the count; cleared whenever a recipient is added
+        self._subscriber_count_cache = TTLCache(ttl=timedelta(seconds=30), maxsize=2)
     
     async def send_trending_topics_email(self, recipients: List[EmailRecipient], 
                                        hours_back: int = 24, 
@@ -74,8 +81,8 @@ class EmailNotificationService:
             Dictionary with send results
         """
         try:
-            # Get trending data
-            trending_data = self.trending_analyzer.get_trending_summary(hours_back)
+            # Get trending data; a DB scan plus keyword extraction, so off the loop
+            trending_data = await asyncio.to_thread(self.trending_analyzer.get_trending_summary, hours_back)
             
             if not recipients:
                 return {
@@ -209,33 +216,35 @@ class EmailNotificationService:
     async def _send_bulk_emails(self, recipients: List[EmailRecipient], 
                                subject: str, html_content: str, 
                                text_content: str) -> Dict[str, Any]:
-        """Send emails to multiple recipients"""
-        sent_count = 0
+        """Send emails to multiple recipients, a few at a time"""
         failed_emails = []
+        # Cap concurrent sessions to avoid overwhelming the SMTP server
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SENDS)
         
-        for recipient in recipients:
-            if not recipient.subscribed:
-                continue
-                
-            try:
-                await self._send_single_email(
-                    to_email=recipient.email,
-                    to_name=recipient.name,
-                    subject=subject,
-                    html_content=html_content,
-                    text_content=text_content
-                )
-                sent_count += 1
-                
-            except Exception as e:
-                self.logger.error(f"Failed to send email to {recipient.email}: {e}")
-                failed_emails.append({
-                    'email': recipient.email,
-                    'error': str(e)
-                })
+        async def send(recipient: EmailRecipient) -> bool:
+            async with semaphore:
+                try:
+                    await self._send_single_email(
+                        to_email=recipient.email,
+                        to_name=recipient.name,
+                        subject=subject,
+                        html_content=html_content,
+                        text_content=text_content
+                    )
+                    return True
                 
-            # Small delay to avoid overwhelming SMTP server
-            await asyncio.sleep(0.1)
+                except Exception as e:
+                    self.logger.error(f"Failed to send email to {recipient.email}: {e}")
+                    failed_emails.append({
+                        'email': recipient.email,
+                        'error': str(e)
+                    })
+                    return False
+        
+        results = await asyncio.gather(*(
+            send(recipient) for recipient in recipients if recipient.subscribed
+        ))
+        sent_count = sum(results)
         
         return {
             'success': sent_count > 0,
@@ -294,7 +303,8 @@ class EmailNotificationService:
                     datetime.now(), datetime.now()
                 ))
                 conn.commit()
-                return True
+            self._subscriber_count_cache.clear()
+            return True
         except Exception as e:
             self.logger.error(f"Error adding recipient {email}: {e}")
             return False
@@ -331,6 +341,24 @@ class EmailNotificationService:
             self.logger.error(f"Error getting subscribers: {e}")
             return []
     
+    def get_subscribers_count(self, active_only: bool = True) -> int:
+        """Get the number of email subscribers"""
+        def count() -> int:
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                query = "SELECT COUNT(*) FROM email_subscribers"
+                if active_only:
+                    query += " WHERE subscribed = TRUE"
+                
+                cursor.execute(query)
+                return cursor.fetchone()[0]
+        
+        try:
+            return self._subscriber_count_cache.get_or_compute(active_only, count)[0]
+        except Exception as e:
+            self.logger.error(f"Error counting subscribers: {e}")
+            return 0
+    
     def create_subscribers_table(self):
         """Create the email subscribers table if it doesn't exist"""
         try:
@@ -355,6 +383,85 @@ class EmailNotificationService:
         except Exception as e:
             self.logger.error(f"Error creating subscribers table: {e}")
     
+    def create_email_jobs_table(self):
+        """Create the table tracking background email sends if it doesn't exist"""
+        try:
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS email_jobs (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        job_type TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        recipient_count INTEGER DEFAULT 0,
+                        sent_count INTEGER DEFAULT 0,
+                        failed_count INTEGER DEFAULT 0,
+                        error TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        finished_at TIMESTAMP
+                    )
+                ''')
+                conn.commit()
+        except Exception as e:
+            self.logger.error(f"Error creating email jobs table: {e}")
+    
+    def create_email_job(self, job_type: str, recipient_count: int) -> int:
+        """Record a queued email job and return its id"""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO email_jobs (job_type, status, recipient_count)
+                VALUES (?, 'queued', ?)
+            ''', (job_type, recipient_count))
+            conn.commit()
+            return cursor.lastrowid
+    
+    def _update_email_job(self, job_id: int, status: str, result: Dict[str, Any] = None):
+        result = result or {}
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE email_jobs
+                SET status = ?, sent_count = ?, failed_count = ?, error = ?,
+                    finished_at = CASE WHEN ? IN ('completed', 'failed') THEN ? ELSE finished_at END
+                WHERE id = ?
+            ''', (
+                status, result.get('sent_count', 0), result.get('failed_count', 0),
+                result.get('error'), status, datetime.now(), job_id
+            ))
+            conn.commit()
+    
+    def get_email_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get the status and counts of an email job"""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, job_type, status, recipient_count, sent_count, failed_count,
+                       error, created_at, finished_at
+                FROM email_jobs WHERE id = ?
+            ''', (job_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    async def run_trending_topics_job(self, job_id: int, recipients: List[EmailRecipient],
+                                      hours_back: int = 24,
+                                      base_url: str = "http://127.0.0.1:8000"):
+        """Send the trending topics email for a queued job, recording the outcome on the job"""
+        # Job updates are blocking sqlite writes; keep them off the event loop
+        try:
+            await asyncio.to_thread(self._update_email_job, job_id, 'running')
+            result = await self.send_trending_topics_email(
+                recipients=recipients,
+                hours_back=hours_back,
+                base_url=base_url
+            )
+            await asyncio.to_thread(
+                self._update_email_job, job_id, 'completed' if result['success'] else 'failed', result
+            )
+        except Exception as e:
+            self.logger.error(f"Error running email job {job_id}: {e}")
+            await asyncio.to_thread(self._update_email_job, job_id, 'failed', {'error': str(e)})
+    
     async def send_test_email(self, test_email: str) -> Dict[str, Any]:
         """Send a test email to verify configuration"""
         try:
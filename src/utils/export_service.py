@@ -3,15 +3,74 @@ CSV Export service for Daily Digest
 """
 import csv
 import io
+import itertools
 import logging
+import queue
+import re
+import sqlite3
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from dataclasses import dataclass
 
 from ..storage.database import DatabaseManager
 from ..processor.trending_analyzer import TrendingAnalyzer
 
 
+# WHERE clauses for the ExportOptions filters, one mask bit each
+_EXPORT_FILTERS = (
+    "scraped_date >= ?",
+    "scraped_date <= ?",
+    "source = ?",
+    "sentiment_label = ?",
+)
+_EXPORT_LIMIT_BIT = 1 << len(_EXPORT_FILTERS)
+_EXPORT_CONTENT_BIT = _EXPORT_LIMIT_BIT << 1
+
+# Selected in CSV column order so rows can be written positionally
+_EXPORT_COLUMNS = (
+    "id, title, source, url, published_date, scraped_date, "
+    "sentiment_score, sentiment_label, category, keywords, author"
+)
+_EXPORT_CONTENT_COLUMNS = ", content, summary"
+
+
+def _build_export_query(mask: int) -> str:
+    """Build the article export query for a combination of active filters"""
+    columns = _EXPORT_COLUMNS
+    if mask & _EXPORT_CONTENT_BIT:
+        columns += _EXPORT_CONTENT_COLUMNS
+    query = f"SELECT {columns} FROM articles"
+    
+    where_clauses = [clause for bit, clause in enumerate(_EXPORT_FILTERS) if mask & (1 << bit)]
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    
+    query += " ORDER BY scraped_date DESC"
+    
+    if mask & _EXPORT_LIMIT_BIT:
+        query += " LIMIT ?"
+    
+    return query
+
+
+# Every filter combination maps to one fixed SQL text, built once at import,
+# so sqlite3's statement cache can reuse the prepared plan between exports
+_EXPORT_QUERIES = {mask: _build_export_query(mask) for mask in range(_EXPORT_CONTENT_BIT << 1)}
+
+# Mirror csv.writer's default dialect: minimal quoting and CRLF line endings
+_CSV_LINE_END = '\r\n'
+_NEEDS_QUOTE = re.compile(r'[",\r\n]').search
+
+
+def _quote_csv(value: Any) -> str:
+    """Render a single CSV field, quoting it only when it needs it"""
+    text = '' if value is None else str(value)
+    if _NEEDS_QUOTE(text):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
 @dataclass
 class ExportOptions:
     """Options for CSV export"""
@@ -21,15 +80,25 @@ class ExportOptions:
     source_filter: Optional[str] = None
     sentiment_filter: Optional[str] = None
     max_records: Optional[int] = None
+    fast: bool = False  # Write rows directly instead of through csv.writer (metadata-only exports)
 
 
 class CSVExportService:
     """Service for exporting data to CSV format"""
     
+    # The 7-day activity count drifts with the clock even when no rows change
+    STATS_CACHE_TTL = timedelta(minutes=5)
+    
+    # Rows fetched per round-trip, and batches the reader may run ahead by
+    EXPORT_BATCH_SIZE = 1000
+    EXPORT_QUEUE_SIZE = 64
+    PARALLEL_EXPORT_MIN_RECORDS = 5000
+    
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
         self.logger = logging.getLogger('csv_export')
         self.trending_analyzer = TrendingAnalyzer(db_manager)
+        self._stats_cache = None
     
     def export_articles(self, options: ExportOptions = None) -> str:
         """
@@ -41,17 +110,37 @@ class CSVExportService:
         Returns:
             CSV content as string
         """
+        return ''.join(self.iter_export_articles(options))
+    
+    def iter_export_articles(self, options: ExportOptions = None) -> Iterator[str]:
+        """
+        Export articles to CSV format, one chunk per batch of rows, so the
+        whole export never has to sit in memory at once
+        
+        Args:
+            options: Export options for filtering and customization
+        
+        Yields:
+            Consecutive pieces of the CSV content, header first
+        """
         if options is None:
             options = ExportOptions()
         
+        # Small exports are not worth a reader thread
+        if options.max_records and options.max_records < self.PARALLEL_EXPORT_MIN_RECORDS:
+            batches = self._iter_filtered_articles(options)
+        else:
+            batches = self._prefetch_filtered_articles(options)
+        
         try:
-            # Build query based on options
-            articles = self._get_filtered_articles(options)
+            # Pull the first batch up front to detect an empty result
+            first_batch = next(batches, None)
             
-            if not articles:
-                return self._create_empty_csv(['id', 'title', 'source', 'published_date', 'sentiment'])
+            if not first_batch:
+                yield self._create_empty_csv(['id', 'title', 'source', 'published_date', 'sentiment'])
+                return
             
-            # Create CSV content
+            # Holds one batch of CSV content at a time
             output = io.StringIO()
             
             # Define column headers
@@ -63,38 +152,28 @@ class CSVExportService:
             if options.include_content:
                 headers.extend(['content', 'summary'])
             
-            writer = csv.writer(output)
-            writer.writerow(headers)
+            # Content and summary almost always need quoting, so the
+            # fast path only covers the fixed metadata columns
+            if options.fast and not options.include_content:
+                output.write(','.join(headers) + _CSV_LINE_END)
+                write_rows, format_rows = output.writelines, self._format_articles_fast
+            else:
+                writer = csv.writer(output)
+                writer.writerow(headers)
+                write_rows, format_rows = writer.writerows, self._format_articles
             
             # Write article data
-            for article in articles:
-                row = [
-                    article.get('id', ''),
-                    article.get('title', ''),
-                    article.get('source', ''),
-                    article.get('url', ''),
-                    self._format_datetime(article.get('published_date')),
-                    self._format_datetime(article.get('scraped_date')),
-                    article.get('sentiment_score', ''),
-                    article.get('sentiment_label', ''),
-                    article.get('category', ''),
-                    article.get('keywords', ''),
-                    article.get('author', '')
-                ]
-                
-                if options.include_content:
-                    row.extend([
-                        article.get('content', ''),
-                        article.get('summary', '')
-                    ])
-                
-                writer.writerow(row)
-            
-            return output.getvalue()
-            
+            for batch in itertools.chain((first_batch,), batches):
+                write_rows(format_rows(batch))
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        
         except Exception as e:
             self.logger.error(f"Error exporting articles: {e}")
             raise
+        finally:
+            batches.close()
     
     def export_analytics_summary(self, days_back: int = 30) -> str:
         """
@@ -130,23 +209,28 @@ class CSVExportService:
             # Write sentiment distribution
             writer.writerow(['=== SENTIMENT DISTRIBUTION ==='])
             writer.writerow(['Sentiment', 'Count', 'Percentage'])
-            total_sentiment = sum(sentiment_dist.values()) if sentiment_dist else 1
+            total_sentiment = sum(sentiment_dist.values()) or 1
+            to_percentage = 100.0 / total_sentiment
             
-            for sentiment, count in sentiment_dist.items():
-                percentage = (count / total_sentiment) * 100
-                writer.writerow([sentiment.title(), count, f'{percentage:.1f}%'])
+            writer.writerows(
+                (sentiment.title(), count, f'{count * to_percentage:.1f}%')
+                for sentiment, count in sentiment_dist.items()
+            )
             writer.writerow([])
             
             # Write articles by source
             writer.writerow(['=== ARTICLES BY SOURCE ==='])
             writer.writerow(['Source', 'Article Count', 'Avg Sentiment'])
             
-            for source_data in articles_by_source:
-                writer.writerow([
+            format_sentiment = '{:.3f}'.format
+            writer.writerows(
+                (
                     source_data['source'],
                     source_data['count'],
-                    f"{source_data['avg_sentiment']:.3f}" if source_data['avg_sentiment'] else 'N/A'
-                ])
+                    format_sentiment(source_data['avg_sentiment']) if source_data['avg_sentiment'] is not None else 'N/A'
+                )
+                for source_data in articles_by_source
+            )
             writer.writerow([])
             
             # Write trending keywords
@@ -219,79 +303,123 @@ class CSVExportService:
             self.logger.error(f"Error exporting trending topics: {e}")
             raise
     
-    def _get_filtered_articles(self, options: ExportOptions) -> List[Dict[str, Any]]:
-        """Get articles based on filter options"""
-        with self.db_manager.get_connection() as conn:
+    def _iter_filtered_articles(self, options: ExportOptions) -> Iterator[List[sqlite3.Row]]:
+        """Yield batches of article rows, in _EXPORT_COLUMNS order, matching the filter options"""
+        with self.db_manager.get_readonly_connection() as conn:
             cursor = conn.cursor()
             
-            query = "SELECT * FROM articles"
+            # Set a mask bit per active filter, in _EXPORT_FILTERS order
+            mask = 0
             params = []
-            where_clauses = []
-            
-            # Apply filters
-            if options.date_from:
-                where_clauses.append("scraped_date >= ?")
-                params.append(options.date_from)
-            
-            if options.date_to:
-                where_clauses.append("scraped_date <= ?")
-                params.append(options.date_to)
-            
-            if options.source_filter:
-                where_clauses.append("source = ?")
-                params.append(options.source_filter)
-            
-            if options.sentiment_filter:
-                where_clauses.append("sentiment_label = ?")
-                params.append(options.sentiment_filter)
-            
-            # Build WHERE clause
-            if where_clauses:
-                query += " WHERE " + " AND ".join(where_clauses)
-            
-            # Add ordering
-            query += " ORDER BY scraped_date DESC"
-            
-            # Add limit
-            if options.max_records:
-                query += " LIMIT ?"
-                params.append(options.max_records)
-            
-            cursor.execute(query, params)
-            
-            # Convert to list of dictionaries
-            articles = []
-            for row in cursor.fetchall():
-                articles.append({
-                    'id': row['id'],
-                    'title': row['title'],
-                    'content': row['content'],
-                    'summary': row['summary'],
-                    'url': row['url'],
-                    'source': row['source'],
-                    'published_date': row['published_date'],
-                    'scraped_date': row['scraped_date'],
-                    'sentiment_score': row['sentiment_score'],
-                    'sentiment_label': row['sentiment_label'],
-                    'category': row['category'],
-                    'keywords': row['keywords'],
-                    'author': row['author']
-                })
-            
-            return articles
+            for bit, value in enumerate((
+                options.date_from,
+                options.date_to,
+                options.source_filter,
+                options.sentiment_filter,
+                options.max_records
+            )):
+                if value:
+                    mask |= 1 << bit
+                    params.append(value)
+            
+            if options.include_content:
+                mask |= _EXPORT_CONTENT_BIT
+            
+            query = _EXPORT_QUERIES[mask]
+            
+            cursor.execute(query, tuple(params))
+            
+            # Hand the rows on as-is, one batch at a time
+            while True:
+                rows = cursor.fetchmany(self.EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                
+                yield rows
+    
+    def _prefetch_filtered_articles(self, options: ExportOptions) -> Iterator[List[sqlite3.Row]]:
+        """
+        Yield the same batches as _iter_filtered_articles, read ahead on a
+        separate thread so the database fetch overlaps with CSV formatting
+        """
+        batches = queue.Queue(maxsize=self.EXPORT_QUEUE_SIZE)
+        done = object()
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            # Poll so an abandoned export does not leave the reader blocked forever
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def read():
+            try:
+                for batch in self._iter_filtered_articles(options):
+                    if not put(batch):
+                        return
+            except Exception as e:
+                put(e)
+            finally:
+                put(done)
+        
+        reader = threading.Thread(target=read, name='csv-export-reader', daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            reader.join()
+    
+    def _format_articles(self, articles: List[sqlite3.Row]) -> Iterator[tuple]:
+        """Turn a batch of article rows into CSV rows"""
+        format_datetime = self._format_datetime
+        for article in articles:
+            # published_date and scraped_date sit at 4 and 5; content columns, if any, trail after author
+            yield article[:4] + (format_datetime(article[4]), format_datetime(article[5])) + article[6:]
+    
+    def _format_articles_fast(self, articles: List[sqlite3.Row]) -> Iterator[str]:
+        """Turn a batch of article rows into CSV lines without going through csv.writer"""
+        format_datetime = self._format_datetime
+        quote = _quote_csv
+        join = ','.join
+        for article in articles:
+            sentiment_score = article[6]
+            yield join((
+                str(article[0]),
+                quote(article[1]),
+                quote(article[2]),
+                quote(article[3]),
+                quote(format_datetime(article[4])),
+                quote(format_datetime(article[5])),
+                '' if sentiment_score is None else str(sentiment_score),
+                quote(article[7]),
+                quote(article[8]),
+                quote(article[9]),
+                quote(article[10])
+            )) + _CSV_LINE_END
     
     def _get_articles_by_source(self, cutoff_date: datetime) -> List[Dict[str, Any]]:
-        """Get article statistics by source"""
-        with self.db_manager.get_connection() as conn:
+        """Get article statistics by source, at day granularity, from the trigger-maintained rollup"""
+        with self.db_manager.get_readonly_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT 
-                    source, 
-                    COUNT(*) as count,
-                    AVG(sentiment_score) as avg_sentiment
-                FROM articles 
-                WHERE scraped_date >= ?
-                GROUP BY source 
+                SELECT
+                    source,
+                    SUM(article_count) as count,
+                    SUM(sentiment_total) / SUM(sentiment_count) as avg_sentiment
+                FROM source_daily_stats
+                WHERE day >= date(?)
+                GROUP BY source
                 ORDER BY count DESC
             ''', (cutoff_date,))
             
@@ -335,34 +463,45 @@ class CSVExportService:
     def get_export_stats(self) -> Dict[str, Any]:
         """Get statistics about available data for export"""
         try:
-            total_articles = self.db_manager.get_article_count()
-            
-            with self.db_manager.get_connection() as conn:
+            # The (MIN, MAX) rowid key is two index lookups on the pooled
+            # connection; only a miss pays for a read-only connection
+            cache_key = self.db_manager.get_data_version()
+            if self._stats_cache is not None:
+                cached_key, cached_at, cached_stats = self._stats_cache
+                if cached_key == cache_key and datetime.now() - cached_at < self.STATS_CACHE_TTL:
+                    return cached_stats
+            
+            with self.db_manager.get_readonly_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Get date range
-                cursor.execute('SELECT MIN(scraped_date), MAX(scraped_date) FROM articles')
-                date_range = cursor.fetchone()
+                # Get total, date range and recent activity (last 7 days) in one query
+                week_ago = datetime.now() - timedelta(days=7)
+                cursor.execute('''
+                    SELECT
+                        COUNT(*),
+                        MIN(scraped_date),
+                        MAX(scraped_date),
+                        (SELECT COUNT(*) FROM articles WHERE scraped_date >= ?)
+                    FROM articles
+                ''', (week_ago,))
+                total_articles, earliest, latest, recent_articles = cursor.fetchone()
                 
                 # Get sources
                 cursor.execute('SELECT DISTINCT source FROM articles')
                 sources = [row['source'] for row in cursor.fetchall()]
-                
-                # Get recent activity (last 7 days)
-                week_ago = datetime.now() - timedelta(days=7)
-                cursor.execute('SELECT COUNT(*) FROM articles WHERE scraped_date >= ?', (week_ago,))
-                recent_articles = cursor.fetchone()[0]
             
-            return {
+            stats = {
                 'total_articles': total_articles,
                 'sources': sources,
                 'date_range': {
-                    'earliest': date_range[0] if date_range[0] else None,
-                    'latest': date_range[1] if date_range[1] else None
+                    'earliest': earliest if earliest else None,
+                    'latest': latest if latest else None
                 },
                 'recent_articles_7_days': recent_articles
             }
-            
+            self._stats_cache = (cache_key, datetime.now(), stats)
+            return stats
+        
         except Exception as e:
             self.logger.error(f"Error getting export stats: {e}")
             return {
@@ -1,21 +1,38 @@
-from fastapi import FastAPI, HTTPException, Query, Depends
-from fastapi.responses import HTMLResponse, Response
+from fastapi import FastAPI, HTTPException, Query, Depends, BackgroundTasks
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi import Request
-from typing import List, Optional, Dict, Any
+from typing import List, Optional
+import itertools
+import logging
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 
 from ..storage.database import DatabaseManager
 from ..utils.config import get_config
 from ..scraper.news_sources import NewsSourceManager
-from ..processor.sentiment_analyzer import SentimentAnalyzer
-from ..processor.summarizer import TextSummarizer
-from ..scraper.content_extractor import ContentExtractor
+from ..processor.pipeline import process_articles
 from ..utils.email_service import EmailNotificationService, EmailConfig, EmailRecipient
 from ..utils.export_service import CSVExportService, ExportOptions
+from ..utils.cache import TTLCache
+from .schemas import ArticleDetailOut, ArticleSearchOut, ArticleSummaryOut, SourceOut
 
-app = FastAPI(title="Daily Digest", version="1.0.0")
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered by orjson; FastAPI's own ORJSONResponse is deprecated"""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+# Handlers that only make blocking DatabaseManager calls are plain `def`, so
+# FastAPI runs them in its threadpool instead of on the event loop
+app = FastAPI(title="Daily Digest", version="1.0.0", default_response_class=OrjsonResponse)
+# Article lists and CSV exports compress well; streamed exports are compressed chunk by chunk
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+logger = logging.getLogger('web')
 
 config = get_config()
 db_config = config.get_database_config()
@@ -24,6 +41,14 @@ db_manager = DatabaseManager(db_config.get('path', 'data/daily-digest.db'))
 templates_dir = os.path.join(os.path.dirname(__file__), "templates")
 templates = Jinja2Templates(directory=templates_dir)
 
+# Outside reload mode, templates are compiled once (cached as bytecode across
+# restarts) and never stat-ed again; the page templates are loaded up front
+# so the first request does not pay for it
+templates.env.auto_reload = config.get_web_config().get('reload', False)
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+for template_name in ("index.html", "article.html", "search.html", "analytics.html"):
+    templates.get_template(template_name)
+
 # Setup email service
 email_service = None
 def setup_email_service():
@@ -46,6 +71,7 @@ def setup_email_service():
                 templates_dir=templates_dir
             )
             email_service.create_subscribers_table()
+            email_service.create_email_jobs_table()
             
             # Add default recipients
             for recipient in email_config.get('default_recipients', []):
@@ -58,6 +84,29 @@ def setup_email_service():
 
 setup_email_service()
 
+# Shared so the export stats cache survives between requests
+export_service = CSVExportService(db_manager)
+
+# Slow-changing aggregate endpoints; cleared whenever a scrape adds articles
+response_cache = TTLCache(ttl=timedelta(seconds=120))
+
+def cached(response: Response, key, compute):
+    value, hit = response_cache.get_or_compute(key, compute)
+    response.headers["X-Cache"] = "HIT" if hit else "MISS"
+    return value
+
+def check_etag(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return a 304 if the client already has this version, otherwise tag the response"""
+    headers = {"ETag": etag, "Cache-Control": "max-age=30, must-revalidate"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+def data_etag(data_version: str, *key) -> str:
+    # Weak, since gzip may change the bytes on the wire
+    return 'W/"' + '-'.join(map(str, (data_version,) + key)) + '"'
+
 def get_db():
     return db_manager
 
@@ -65,9 +114,11 @@ def get_email_service():
     return email_service
 
 def get_export_service():
-    return CSVExportService(db_manager)
+    return export_service
 
-def get_news_manager():
+# Built once, so every scrape reuses the scrapers and their HTTP sessions
+@lru_cache(maxsize=1)
+def _news_manager() -> NewsSourceManager:
     scraping_config = config.get_scraping_config()
     news_manager = NewsSourceManager(scraping_config)
     
@@ -76,8 +127,11 @@ def get_news_manager():
     
     return news_manager
 
+def get_news_manager():
+    return _news_manager()
+
 @app.get("/", response_class=HTMLResponse)
-async def home(request: Request, db: DatabaseManager = Depends(get_db)):
+def home(request: Request, db: DatabaseManager = Depends(get_db)):
     articles = db.get_articles(limit=20)
     return templates.TemplateResponse("index.html", {
         "request": request,
@@ -85,168 +139,122 @@ async def home(request: Request, db: DatabaseManager = Depends(get_db)):
         "title": "Latest News"
     })
 
-@app.get("/api/articles", response_model=List[Dict[str, Any]])
-async def get_articles(
+@app.get("/api/articles", response_model=List[ArticleSummaryOut])
+def get_articles(
+    request: Request,
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     source: Optional[str] = Query(None),
     db: DatabaseManager = Depends(get_db)
 ):
-    articles = db.get_articles(limit=limit, offset=offset, source=source)
-    return [
-        {
-            "id": article.id,
-            "title": article.title,
-            "summary": article.summary,
-            "url": article.url,
-            "source": article.source,
-            "published_date": article.published_date.isoformat() if article.published_date else None,
-            "scraped_date": article.scraped_date.isoformat() if article.scraped_date else None,
-            "sentiment_score": article.sentiment_score,
-            "sentiment_label": article.sentiment_label,
-            "category": article.category,
-            "keywords": article.keywords,
-            "author": article.author
-        }
-        for article in articles
-    ]
+    not_modified = check_etag(
+        request, response, data_etag(db.get_data_version(), "articles", limit, offset, source)
+    )
+    if not_modified:
+        return not_modified
+    
+    return db.get_articles_raw(limit=limit, offset=offset, source=source)
 
-@app.get("/api/articles/{article_id}")
-async def get_article(article_id: int, db: DatabaseManager = Depends(get_db)):
+@app.get("/api/articles/{article_id}", response_model=ArticleDetailOut)
+def get_article(article_id: int, db: DatabaseManager = Depends(get_db)):
     article = db.get_article_by_id(article_id)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     
-    return {
-        "id": article.id,
-        "title": article.title,
-        "content": article.content,
-        "summary": article.summary,
-        "url": article.url,
-        "source": article.source,
-        "published_date": article.published_date.isoformat() if article.published_date else None,
-        "scraped_date": article.scraped_date.isoformat() if article.scraped_date else None,
-        "sentiment_score": article.sentiment_score,
-        "sentiment_label": article.sentiment_label,
-        "category": article.category,
-        "keywords": article.keywords,
-        "author": article.author
-    }
+    return article
 
-@app.get("/api/sources")
-async def get_sources(db: DatabaseManager = Depends(get_db)):
-    sources = db.get_sources()
-    return [
-        {
-            "id": source.id,
-            "name": source.name,
-            "base_url": source.base_url,
-            "last_scraped": source.last_scraped.isoformat() if source.last_scraped else None,
-            "is_active": source.is_active,
-            "success_count": source.success_count,
-            "error_count": source.error_count
-        }
-        for source in sources
-    ]
+@app.get("/api/sources", response_model=List[SourceOut])
+def get_sources(response: Response, db: DatabaseManager = Depends(get_db)):
+    return cached(response, ("sources",), db.get_sources)
 
-@app.get("/api/search")
-async def search_articles(
+@app.get("/api/search", response_model=List[ArticleSearchOut])
+def search_articles(
     q: str = Query(..., min_length=2),
     limit: int = Query(20, ge=1, le=100),
     db: DatabaseManager = Depends(get_db)
 ):
-    articles = db.search_articles(q, limit=limit)
-    return [
-        {
-            "id": article.id,
-            "title": article.title,
-            "summary": article.summary,
-            "url": article.url,
-            "source": article.source,
-            "published_date": article.published_date.isoformat() if article.published_date else None,
-            "sentiment_score": article.sentiment_score,
-            "sentiment_label": article.sentiment_label,
-            "keywords": article.keywords
-        }
-        for article in articles
-    ]
+    return db.search_articles_raw(q, limit=limit)
 
 @app.get("/api/analytics/sentiment")
-async def get_sentiment_distribution(db: DatabaseManager = Depends(get_db)):
-    distribution = db.get_sentiment_distribution()
-    total_articles = db.get_article_count()
+def get_sentiment_distribution(request: Request, response: Response, db: DatabaseManager = Depends(get_db)):
+    # Writers other than /api/scrape (the scheduler) don't clear the response
+    # cache, so key it on the same version as the ETag
+    data_version = db.get_data_version()
+    not_modified = check_etag(request, response, data_etag(data_version, "sentiment"))
+    if not_modified:
+        return not_modified
     
-    return {
-        "distribution": distribution,
-        "total_articles": total_articles,
-        "percentages": {
-            label: round((count / total_articles) * 100, 2)
-            for label, count in distribution.items()
-        } if total_articles > 0 else {}
-    }
+    def compute():
+        distribution, total_articles = db.get_sentiment_summary()
+        
+        return {
+            "distribution": distribution,
+            "total_articles": total_articles,
+            "percentages": {
+                label: round((count / total_articles) * 100, 2)
+                for label, count in distribution.items()
+            } if total_articles > 0 else {}
+        }
+    
+    return cached(response, ("sentiment", data_version), compute)
 
 @app.get("/api/analytics/trends")
-async def get_trending_topics(
+def get_trending_topics(
+    response: Response,
     limit: int = Query(10, ge=1, le=50),
     db: DatabaseManager = Depends(get_db)
 ):
-    trends = db.get_trending_keywords(limit=limit)
-    return {
-        "trending_keywords": trends,
-        "generated_at": datetime.now().isoformat()
-    }
+    def compute():
+        return {
+            "trending_keywords": db.get_trending_keywords(limit=limit),
+            "generated_at": datetime.now().isoformat()
+        }
+    
+    return cached(response, ("trends", limit), compute)
 
-@app.post("/api/scrape")
-async def trigger_scraping(
-    source: Optional[str] = Query(None),
-    news_manager: NewsSourceManager = Depends(get_news_manager),
-    db: DatabaseManager = Depends(get_db)
-):
+def _run_scrape(news_manager: NewsSourceManager, db: DatabaseManager, source: Optional[str] = None):
+    """Scrape, enrich and store articles; runs after the /api/scrape response is sent"""
     try:
-        sentiment_analyzer = SentimentAnalyzer()
-        summarizer = TextSummarizer()
-        content_extractor = ContentExtractor()
+        start_time = datetime.now()
         
         if source:
             articles = news_manager.scrape_source(source)
-            results = {source: len(articles)}
         else:
-            all_results = news_manager.scrape_all_sources()
-            results = {src: len(arts) for src, arts in all_results.items()}
             articles = []
-            for source_articles in all_results.values():
+            for source_articles in news_manager.scrape_all_sources().values():
                 articles.extend(source_articles)
         
-        processed_count = 0
-        for article in articles:
-            if content_extractor.is_quality_content(article.title, article.content):
-                sentiment_score, sentiment_label = sentiment_analyzer.analyze_sentiment_simple(
-                    f"{article.title} {article.content}"
-                )
-                article.sentiment_score = sentiment_score
-                article.sentiment_label = sentiment_label
-                
-                article.summary = summarizer.summarize(article.content)
-                article.keywords = content_extractor.extract_keywords(article.content)
-                
-                if db.add_article(article):
-                    processed_count += 1
-                    db.update_source_stats(article.source, True)
-                else:
-                    db.update_source_stats(article.source, False)
+        processed_count = db.add_articles_bulk(process_articles(articles))
         
-        return {
-            "message": "Scraping completed",
-            "scraped_by_source": results,
-            "processed_articles": processed_count,
-            "timestamp": datetime.now().isoformat()
-        }
+        response_cache.clear()
+        
+        duration = datetime.now() - start_time
+        logger.info(
+            f"Scraping completed in {duration.total_seconds():.1f}s. "
+            f"Scraped: {len(articles)}, Processed: {processed_count}"
+        )
     
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Scraping failed: {str(e)}")
+        logger.error(f"Scraping failed: {e}")
+
+@app.post("/api/scrape")
+async def trigger_scraping(
+    background_tasks: BackgroundTasks,
+    source: Optional[str] = Query(None),
+    news_manager: NewsSourceManager = Depends(get_news_manager),
+    db: DatabaseManager = Depends(get_db)
+):
+    background_tasks.add_task(_run_scrape, news_manager, db, source)
+    
+    return {
+        "message": "Scraping started",
+        "source": source,
+        "timestamp": datetime.now().isoformat()
+    }
 
 @app.get("/article/{article_id}", response_class=HTMLResponse)
-async def view_article(
+def view_article(
     request: Request,
     article_id: int,
     db: DatabaseManager = Depends(get_db)
@@ -262,7 +270,7 @@ async def view_article(
     })
 
 @app.get("/search", response_class=HTMLResponse)
-async def search_page(
+def search_page(
     request: Request,
     q: Optional[str] = Query(None),
     db: DatabaseManager = Depends(get_db)
@@ -279,13 +287,12 @@ async def search_page(
     })
 
 @app.get("/analytics", response_class=HTMLResponse)
-async def analytics_page(
+def analytics_page(
     request: Request,
     db: DatabaseManager = Depends(get_db)
 ):
-    sentiment_dist = db.get_sentiment_distribution()
+    sentiment_dist, total_articles = db.get_sentiment_summary()
     trending_keywords = db.get_trending_keywords(limit=20)
-    total_articles = db.get_article_count()
     
     return templates.TemplateResponse("analytics.html", {
         "request": request,
@@ -304,41 +311,58 @@ async def health_check():
     }
 
 # Email API endpoints
-@app.post("/api/email/send-trending")
+@app.post("/api/email/send-trending", status_code=202)
 async def send_trending_email(
+    background_tasks: BackgroundTasks,
+    response: Response,
     hours_back: int = 24,
     email_service: EmailNotificationService = Depends(get_email_service)
 ):
-    """Send trending topics email immediately"""
+    """Queue the trending topics email; poll /api/email/jobs/{job_id} for the outcome"""
     if not email_service:
         raise HTTPException(status_code=503, detail="Email service not configured")
     
     try:
         # Get subscribers
-        recipients = email_service.get_subscribers(active_only=True)
+        recipients = await run_in_threadpool(email_service.get_subscribers, active_only=True)
         
         if not recipients:
+            # Nothing was queued, so this isn't a 202
+            response.status_code = 200
             return {"success": False, "message": "No active subscribers found"}
         
-        # Send email
         web_config = config.get_web_config()
         base_url = f"http://{web_config.get('host', '127.0.0.1')}:{web_config.get('port', 8000)}"
         
-        result = await email_service.send_trending_topics_email(
-            recipients=recipients,
-            hours_back=hours_back,
-            base_url=base_url
+        job_id = await run_in_threadpool(email_service.create_email_job, 'trending_topics', len(recipients))
+        background_tasks.add_task(
+            email_service.run_trending_topics_job, job_id, recipients, hours_back, base_url
         )
         
         return {
-            "success": result['success'],
-            "message": f"Email sent to {result['sent_count']} recipients" if result['success'] else result.get('error'),
-            "sent_count": result['sent_count'],
-            "failed_count": result.get('failed_count', 0)
+            "success": True,
+            "status": "queued",
+            "job_id": job_id,
+            "recipient_count": len(recipients)
         }
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to send email: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to queue email: {str(e)}")
+
+@app.get("/api/email/jobs/{job_id}")
+def get_email_job(
+    job_id: int,
+    email_service: EmailNotificationService = Depends(get_email_service)
+):
+    """Get the status of a queued email send"""
+    if not email_service:
+        raise HTTPException(status_code=503, detail="Email service not configured")
+    
+    job = email_service.get_email_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Email job not found")
+    
+    return job
 
 @app.post("/api/email/test")
 async def send_test_email(
@@ -359,21 +383,22 @@ async def send_test_email(
 async def email_status():
     """Get email service status"""
     email_config = config.get_email_config()
+    subscribers_count = await run_in_threadpool(email_service.get_subscribers_count) if email_service else 0
     return {
         "enabled": email_config.get('enabled', False) and email_service is not None,
         "configured": bool(email_service),
         "smtp_server": email_config.get('smtp_server', 'Not configured'),
         "from_email": email_config.get('from_email', 'Not configured'),
-        "subscribers_count": len(email_service.get_subscribers()) if email_service else 0
+        "subscribers_count": subscribers_count
     }
 
 # CSV Export API endpoints
 
 @app.get("/api/export/articles")
-async def export_articles_csv(
+def export_articles_csv(
     include_content: bool = Query(False, description="Include full article content"),
-    date_from: Optional[str] = Query(None, description="Filter from date (YYYY-MM-DD)"),
-    date_to: Optional[str] = Query(None, description="Filter to date (YYYY-MM-DD)"),
+    date_from: Optional[datetime] = Query(None, description="Filter from date (YYYY-MM-DD)"),
+    date_to: Optional[datetime] = Query(None, description="Filter to date (YYYY-MM-DD)"),
     source_filter: Optional[str] = Query(None, description="Filter by source"),
     sentiment_filter: Optional[str] = Query(None, description="Filter by sentiment (positive/negative/neutral)"),
     max_records: Optional[int] = Query(None, ge=1, le=10000, description="Maximum records to export"),
@@ -381,31 +406,25 @@ async def export_articles_csv(
 ):
     """Export articles to CSV format"""
     try:
-        # Parse dates if provided
-        date_from_dt = None
-        date_to_dt = None
-        if date_from:
-            date_from_dt = datetime.fromisoformat(date_from)
-        if date_to:
-            date_to_dt = datetime.fromisoformat(date_to)
-        
         options = ExportOptions(
             include_content=include_content,
-            date_from=date_from_dt,
-            date_to=date_to_dt,
+            date_from=date_from,
+            date_to=date_to,
             source_filter=source_filter,
             sentiment_filter=sentiment_filter,
             max_records=max_records
         )
         
-        csv_content = export_service.export_articles(options)
+        # Run the query before streaming starts, so failures still become a 500
+        chunks = export_service.iter_export_articles(options)
+        first_chunk = next(chunks)
         
         # Generate filename
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"daily_digest_articles_{timestamp}.csv"
         
-        return Response(
-            content=csv_content,
+        return StreamingResponse(
+            itertools.chain((first_chunk,), chunks),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -414,7 +433,7 @@ async def export_articles_csv(
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
 @app.get("/api/export/analytics")
-async def export_analytics_csv(
+def export_analytics_csv(
     days_back: int = Query(30, ge=1, le=365, description="Number of days to include in analysis"),
     export_service: CSVExportService = Depends(get_export_service)
 ):
@@ -436,7 +455,7 @@ async def export_analytics_csv(
         raise HTTPException(status_code=500, detail=f"Analytics export failed: {str(e)}")
 
 @app.get("/api/export/trending")
-async def export_trending_topics_csv(
+def export_trending_topics_csv(
     hours_back: int = Query(24, ge=1, le=168, description="Hours to look back for trending analysis"),
     export_service: CSVExportService = Depends(get_export_service)
 ):
@@ -458,7 +477,7 @@ async def export_trending_topics_csv(
         raise HTTPException(status_code=500, detail=f"Trending topics export failed: {str(e)}")
 
 @app.get("/api/export/stats")
-async def get_export_stats(
+def get_export_stats(
     export_service: CSVExportService = Depends(get_export_service)
 ):
     """Get statistics about available data for export"""
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, field_serializer
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    # Pydantic writes UTC as 'Z'; keep the '+00:00' isoformat the API returned before
+    return value.isoformat() if value else None
+
+class ArticleSearchOut(BaseModel):
+    """Article fields returned by /api/search"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    title: str
+    summary: Optional[str] = None
+    url: str
+    source: str
+    published_date: Optional[datetime] = None
+    sentiment_score: Optional[float] = None
+    sentiment_label: Optional[str] = None
+    keywords: Optional[str] = None
+    
+    _serialize_published_date = field_serializer('published_date')(_isoformat)
+
+class ArticleSummaryOut(ArticleSearchOut):
+    """Article fields returned by /api/articles"""
+    scraped_date: Optional[datetime] = None
+    category: Optional[str] = None
+    author: Optional[str] = None
+    
+    _serialize_scraped_date = field_serializer('scraped_date')(_isoformat)
+
+class ArticleDetailOut(ArticleSummaryOut):
+    """Full article, as returned by /api/articles/{article_id}"""
+    content: str
+
+class SourceOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    name: str
+    base_url: str
+    last_scraped: Optional[datetime] = None
+    is_active: bool
+    success_count: int
+    error_count: int
+    
+    _serialize_last_scraped = field_serializer('last_scraped')(_isoformat)
@@ -0,0 +1,28 @@
+import pytest
+
+from src.storage.database import DatabaseManager
+
+@pytest.fixture(scope="session")
+def db():
+    """One in-memory database for the whole run, so the schema is built once"""
+    db_manager = DatabaseManager(":memory:")
+    yield db_manager
+    db_manager.close()
+
+@pytest.fixture
+def clean_db(db):
+    """
+    The session database, emptied again after each test
+    
+    DatabaseManager commits its own writes, so a wrapping transaction
+    can't roll them back; delete the rows instead. The search index,
+    article count and daily stats follow through their triggers.
+    """
+    yield db
+    
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM articles")
+        conn.execute("DELETE FROM sources")
+        # Restart AUTOINCREMENT ids so tests see the same ids in any order
+        conn.execute("DELETE FROM sqlite_sequence")
+        conn.commit()
@@ -1,12 +1,16 @@
 import pytest
 import asyncio
+import os
+import tempfile
 from httpx import AsyncClient
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock, ANY
 import pytest_asyncio
 
-from src.web.app import app, get_db
+from src.storage.database import DatabaseManager
+from src.web.app import app, get_db, get_email_service, get_export_service, get_news_manager, response_cache
+from src.utils.email_service import EmailRecipient
 from src.storage.models import Article, Source
-from datetime import datetime
+from datetime import datetime, timezone
 
 @pytest.fixture(scope="function")
 def mock_db():
@@ -16,8 +20,9 @@ def mock_db():
 async def client(mock_db):
     from httpx import ASGITransport
     
-    # Override the dependency
+    # Override the dependency and start from an empty response cache
     app.dependency_overrides[get_db] = lambda: mock_db
+    response_cache.clear()
     
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
@@ -38,21 +43,20 @@ class TestAPI:
     
     @pytest.mark.asyncio
     async def test_get_articles_endpoint(self, client, mock_db):
-        mock_article = Article(
-            id=1,
-            title="Test Article",
-            summary="Test summary",
-            url="https://example.com/test",
-            source="Test Source",
-            published_date=datetime.now(),
-            scraped_date=datetime.now(),
-            sentiment_score=0.5,
-            sentiment_label="positive",
-            category="test",
-            keywords="test, keywords",
-            author="Test Author"
-        )
-        mock_db.get_articles.return_value = [mock_article]
+        mock_db.get_articles_raw.return_value = [{
+            "id": 1,
+            "title": "Test Article",
+            "summary": "Test summary",
+            "url": "https://example.com/test",
+            "source": "Test Source",
+            "published_date": "2024-01-15T10:30:00",
+            "scraped_date": "2024-01-15T11:00:00",
+            "sentiment_score": 0.5,
+            "sentiment_label": "positive",
+            "category": "test",
+            "keywords": "test, keywords",
+            "author": "Test Author"
+        }]
         
         response = await client.get("/api/articles")
         assert response.status_code == 200
@@ -62,6 +66,7 @@ class TestAPI:
         assert data[0]["title"] == "Test Article"
         assert data[0]["source"] == "Test Source"
         assert data[0]["sentiment_label"] == "positive"
+        mock_db.get_articles_raw.assert_called_once_with(limit=20, offset=0, source=None)
     
     @pytest.mark.asyncio
     async def test_get_article_by_id_endpoint(self, client, mock_db):
@@ -89,6 +94,22 @@ class TestAPI:
         assert data["id"] == 1
         assert data["title"] == "Test Article"
         assert data["content"] == "Test content"
+        assert data["published_date"] == mock_article.published_date.isoformat()
+    
+    @pytest.mark.asyncio
+    async def test_get_article_keeps_isoformat_utc_offset(self, client, mock_db):
+        mock_db.get_article_by_id.return_value = Article(
+            id=1,
+            title="Test Article",
+            content="Test content",
+            url="https://example.com/test",
+            source="Test Source",
+            published_date=datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+        )
+        
+        response = await client.get("/api/articles/1")
+        assert response.status_code == 200
+        assert response.json()["published_date"] == "2024-01-15T10:30:00+00:00"
     
     @pytest.mark.asyncio
     async def test_get_article_not_found(self, client, mock_db):
@@ -124,18 +145,17 @@ class TestAPI:
     
     @pytest.mark.asyncio
     async def test_search_articles_endpoint(self, client, mock_db):
-        mock_article = Article(
-            id=1,
-            title="Test Article about Python",
-            summary="Test summary",
-            url="https://example.com/python",
-            source="Test Source",
-            published_date=datetime.now(),
-            sentiment_score=0.5,
-            sentiment_label="positive",
-            keywords="python, programming"
-        )
-        mock_db.search_articles.return_value = [mock_article]
+        mock_db.search_articles_raw.return_value = [{
+            "id": 1,
+            "title": "Test Article about Python",
+            "summary": "Test summary",
+            "url": "https://example.com/python",
+            "source": "Test Source",
+            "published_date": "2024-01-15T10:30:00",
+            "sentiment_score": 0.5,
+            "sentiment_label": "positive",
+            "keywords": "python, programming"
+        }]
         
         response = await client.get("/api/search?q=python")
         assert response.status_code == 200
@@ -147,12 +167,11 @@ class TestAPI:
     
     @pytest.mark.asyncio
     async def test_get_sentiment_distribution(self, client, mock_db):
-        mock_db.get_sentiment_distribution.return_value = {
+        mock_db.get_sentiment_summary.return_value = ({
             "positive": 15,
             "negative": 5,
             "neutral": 10
-        }
-        mock_db.get_article_count.return_value = 30
+        }, 30)
         
         response = await client.get("/api/analytics/sentiment")
         assert response.status_code == 200
@@ -162,6 +181,45 @@ class TestAPI:
         assert data["distribution"]["positive"] == 15
         assert data["percentages"]["positive"] == 50.0
     
+    @pytest.mark.asyncio
+    async def test_sentiment_distribution_cached(self, client, mock_db):
+        mock_db.get_sentiment_summary.return_value = ({"positive": 1}, 1)
+        
+        first = await client.get("/api/analytics/sentiment")
+        second = await client.get("/api/analytics/sentiment")
+        
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+        mock_db.get_sentiment_summary.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_sentiment_distribution_follows_other_writers(self, client):
+        temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_db.close()
+        web_db = DatabaseManager(temp_db.name)
+        # A second manager on the same file, as the scheduler uses
+        scheduler_db = DatabaseManager(temp_db.name)
+        app.dependency_overrides[get_db] = lambda: web_db
+        
+        try:
+            scheduler_db.add_article(Article(title="First", content="Content", url="https://example.com/1",
+                                             source="Test Source", sentiment_label="positive"))
+            first = await client.get("/api/analytics/sentiment")
+            
+            scheduler_db.add_article(Article(title="Second", content="Content", url="https://example.com/2",
+                                             source="Test Source", sentiment_label="negative"))
+            second = await client.get("/api/analytics/sentiment", headers={"If-None-Match": first.headers["ETag"]})
+        finally:
+            web_db.close()
+            scheduler_db.close()
+            os.unlink(temp_db.name)
+        
+        assert first.json()["total_articles"] == 1
+        assert second.status_code == 200
+        assert second.headers["ETag"] != first.headers["ETag"]
+        assert second.json()["total_articles"] == 2
+    
     @pytest.mark.asyncio
     async def test_get_trending_topics(self, client, mock_db):
         mock_db.get_trending_keywords.return_value = [
@@ -177,4 +235,120 @@ class TestAPI:
         assert "trending_keywords" in data
         assert len(data["trending_keywords"]) == 2
         assert data["trending_keywords"][0]["keyword"] == "python"
-        assert data["trending_keywords"][0]["frequency"] == 10
\ No newline at end of file
+        assert data["trending_keywords"][0]["frequency"] == 10
+    
+    @pytest.mark.asyncio
+    async def test_trigger_scraping_runs_in_background(self, client, mock_db):
+        article = Article(
+            title="Test Article",
+            content="Test content",
+            url="https://example.com/test",
+            source="Test Source"
+        )
+        news_manager = Mock()
+        news_manager.scrape_all_sources.return_value = {"Test Source": [article]}
+        app.dependency_overrides[get_news_manager] = lambda: news_manager
+        mock_db.add_articles_bulk.return_value = 1
+        
+        with patch('src.web.app.process_articles', side_effect=lambda articles: articles):
+            response = await client.post("/api/scrape")
+        
+        assert response.status_code == 200
+        assert response.json()["message"] == "Scraping started"
+        mock_db.add_articles_bulk.assert_called_once_with([article])
+    
+    @pytest.mark.asyncio
+    async def test_export_articles_streams_csv(self, client):
+        export_service = Mock()
+        export_service.iter_export_articles.return_value = iter(["id,title\r\n", "1,First\r\n", "2,Second\r\n"])
+        app.dependency_overrides[get_export_service] = lambda: export_service
+        
+        response = await client.get("/api/export/articles?date_from=2024-01-15")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert export_service.iter_export_articles.call_args[0][0].date_from == datetime(2024, 1, 15)
+        assert response.text == "id,title\r\n1,First\r\n2,Second\r\n"
+    
+    @pytest.mark.asyncio
+    async def test_large_responses_are_gzipped(self, client, mock_db):
+        mock_db.search_articles_raw.return_value = [{
+            "id": i,
+            "title": f"Test Article {i}",
+            "url": f"https://example.com/{i}",
+            "source": "Test Source"
+        } for i in range(50)]
+        
+        response = await client.get("/api/search?q=test", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()) == 50
+    
+    @pytest.mark.asyncio
+    async def test_send_trending_email_is_queued(self, client):
+        recipients = [EmailRecipient(email="reader@example.com")]
+        email_service = Mock()
+        email_service.get_subscribers.return_value = recipients
+        email_service.create_email_job.return_value = 7
+        email_service.run_trending_topics_job = AsyncMock()
+        app.dependency_overrides[get_email_service] = lambda: email_service
+        
+        response = await client.post("/api/email/send-trending?hours_back=12")
+        
+        assert response.status_code == 202
+        assert response.json()["job_id"] == 7
+        assert response.json()["recipient_count"] == 1
+        email_service.run_trending_topics_job.assert_awaited_once_with(
+            7, recipients, 12, ANY
+        )
+    
+    @pytest.mark.asyncio
+    async def test_send_trending_email_without_subscribers(self, client):
+        email_service = Mock()
+        email_service.get_subscribers.return_value = []
+        app.dependency_overrides[get_email_service] = lambda: email_service
+        
+        response = await client.post("/api/email/send-trending")
+        
+        assert response.status_code == 200
+        assert response.json()["success"] is False
+        email_service.create_email_job.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_get_email_job_not_found(self, client):
+        email_service = Mock()
+        email_service.get_email_job.return_value = None
+        app.dependency_overrides[get_email_service] = lambda: email_service
+        
+        response = await client.get("/api/email/jobs/99")
+        
+        assert response.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_export_articles_rejects_bad_dates(self, client):
+        export_service = Mock()
+        app.dependency_overrides[get_export_service] = lambda: export_service
+        
+        response = await client.get("/api/export/articles?date_from=2024-13-45")
+        
+        assert response.status_code == 422
+        export_service.iter_export_articles.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_get_articles_not_modified(self, client, mock_db):
+        mock_db.get_data_version.return_value = "1.5"
+        mock_db.get_articles_raw.return_value = []
+        
+        first = await client.get("/api/articles")
+        etag = first.headers["ETag"]
+        second = await client.get("/api/articles", headers={"If-None-Match": etag})
+        
+        assert second.status_code == 304
+        assert second.headers["ETag"] == etag
+        mock_db.get_articles_raw.assert_called_once()
+        
+        mock_db.get_data_version.return_value = "1.6"
+        third = await client.get("/api/articles", headers={"If-None-Match": etag})
+        assert third.status_code == 200
+        assert third.headers["ETag"] != etag
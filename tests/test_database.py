@@ -1,19 +1,18 @@
 import pytest
+import sqlite3
 import tempfile
+import threading
 import os
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 from src.storage.database import DatabaseManager
 from src.storage.models import Article, Source
 
 class TestDatabaseManager:
-    def setup_method(self):
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.db_manager = DatabaseManager(self.temp_db.name)
-    
-    def teardown_method(self):
-        os.unlink(self.temp_db.name)
+    @pytest.fixture(autouse=True)
+    def _use_clean_db(self, clean_db):
+        self.db_manager = clean_db
     
     def test_database_initialization(self):
         with self.db_manager.get_connection() as conn:
@@ -25,6 +24,41 @@ class TestDatabaseManager:
             assert 'sources' in tables
             assert 'articles' in tables
     
+    def test_connection_pool(self):
+        with self.db_manager.get_connection() as conn:
+            conn.execute("INSERT INTO sources (name, base_url) VALUES ('Uncommitted', 'https://example.com')")
+        
+        with self.db_manager.get_connection() as same_conn:
+            assert same_conn is conn
+            assert same_conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0] == 0
+        
+        other = []
+        def use_connection():
+            with self.db_manager.get_connection() as thread_conn:
+                other.append(thread_conn)
+        
+        thread = threading.Thread(target=use_connection)
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+    
+    def test_readonly_connection(self):
+        article = Article(
+            title="Test Article",
+            content="Test content",
+            url="https://example.com/test",
+            source="Test Source"
+        )
+        self.db_manager.add_article(article)
+        
+        with self.db_manager.get_readonly_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT title FROM articles")
+            assert cursor.fetchone()['title'] == "Test Article"
+            
+            with pytest.raises(sqlite3.OperationalError):
+                cursor.execute("DELETE FROM articles")
+    
     def test_add_and_get_sources(self):
         source = Source(
             name="Test Source",
@@ -81,32 +115,77 @@ class TestDatabaseManager:
         assert retrieved_article.title == "Test Article"
         assert retrieved_article.content == "This is test content."
     
-    def test_search_articles(self):
-        article1 = Article(
+    def test_add_articles_bulk(self):
+        self.db_manager.add_source(Source(name="Source A", base_url="https://a.example.com"))
+        self.db_manager.add_source(Source(name="Source B", base_url="https://b.example.com"))
+        self.db_manager.add_article(Article(
+            title="Existing", content="Content", url="https://example.com/1", source="Source B"
+        ))
+        
+        articles = [
+            Article(title="First", content="Content", url="https://example.com/2", source="Source A"),
+            Article(title="Second", content="Content", url="https://example.com/3", source="Source A"),
+            Article(title="Duplicate", content="Content", url="https://example.com/1", source="Source B"),
+        ]
+        
+        assert self.db_manager.add_articles_bulk(articles) == 2
+        assert self.db_manager.get_article_count() == 3
+        assert self.db_manager.get_article_by_id(articles[1].id).title == "Second"
+        assert articles[2].id is None
+        
+        sources = {source.name: source for source in self.db_manager.get_sources()}
+        assert sources["Source A"].success_count == 2
+        assert sources["Source A"].error_count == 0
+        assert sources["Source A"].last_scraped is not None
+        assert sources["Source B"].success_count == 0
+        assert sources["Source B"].error_count == 1
+        assert sources["Source B"].last_scraped is None
+    
+    def test_search_articles_without_fts(self, monkeypatch):
+        monkeypatch.setattr(self.db_manager, 'fts_enabled', False)
+        self.db_manager.add_article(Article(
             title="Machine Learning Article",
             content="This article discusses machine learning algorithms.",
             url="https://example.com/ml",
             source="Test Source"
-        )
+        ))
         
-        article2 = Article(
-            title="Python Programming",
-            content="This article is about Python programming language.",
-            url="https://example.com/python",
+        assert len(self.db_manager.search_articles("learning algo")) == 1
+    
+    def test_search_ranks_newest_candidates(self):
+        for i in range(3):
+            self.db_manager.add_article(Article(
+                title=f"Python Article {i}",
+                content="Python " * (i + 1),
+                url=f"https://example.com/{i}",
+                source="Test Source"
+            ))
+        
+        with patch('src.storage.database.SEARCH_CANDIDATE_LIMIT', 2):
+            results = self.db_manager.search_articles("python")
+        
+        assert sorted(a.title for a in results) == ["Python Article 1", "Python Article 2"]
+    
+    def test_search_index_stays_in_sync(self):
+        article_id = self.db_manager.add_article(Article(
+            title="Node.js Release Notes",
+            content="The runtime ships a faster module loader.",
+            url="https://example.com/node",
             source="Test Source"
-        )
+        ))
         
-        self.db_manager.add_article(article1)
-        self.db_manager.add_article(article2)
+        assert [a.id for a in self.db_manager.search_articles("node.js")] == [article_id]
+        assert [a.id for a in self.db_manager.search_articles("modul")] == [article_id]
         
-        ml_results = self.db_manager.search_articles("machine learning")
-        python_results = self.db_manager.search_articles("Python")
+        with self.db_manager.get_connection() as conn:
+            conn.execute("UPDATE articles SET title = ? WHERE id = ?", ("Deno Release Notes", article_id))
+            conn.commit()
         
-        assert len(ml_results) == 1
-        assert ml_results[0].title == "Machine Learning Article"
+        assert self.db_manager.search_articles("node.js") == []
+        assert len(self.db_manager.search_articles("deno")) == 1
         
-        assert len(python_results) == 1
-        assert python_results[0].title == "Python Programming"
+        self.db_manager.cleanup_old_articles(retention_days=-1)
+        assert self.db_manager.search_articles("deno") == []
     
     def test_duplicate_article_handling(self):
         article1 = Article(
@@ -149,6 +228,17 @@ class TestDatabaseManager:
         assert sources[0].success_count == 1
         assert sources[0].error_count == 1
     
+    def test_bump_source_stats(self):
+        self.db_manager.add_source(Source(name="Test Source", base_url="https://example.com"))
+        
+        self.db_manager.bump_source_stats("Test Source", success_delta=3, error_delta=2)
+        source = self.db_manager.get_sources()[0]
+        assert (source.success_count, source.error_count) == (3, 2)
+        assert source.last_scraped is not None
+        
+        self.db_manager.bump_source_stats("Unknown Source", success_delta=1)
+        assert len(self.db_manager.get_sources()) == 1
+    
     def test_cleanup_old_articles(self):
         old_article = Article(
             title="Old Article",
@@ -164,18 +254,8 @@ class TestDatabaseManager:
             source="Test Source"
         )
         
-        self.db_manager.add_article(old_article)
-        self.db_manager.add_article(new_article)
-        
-        # Manually update the old article's date to be older
-        with self.db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            old_date = datetime.now() - timedelta(days=35)
-            cursor.execute(
-                "UPDATE articles SET scraped_date = ? WHERE title = ?",
-                (old_date, "Old Article")
-            )
-            conn.commit()
+        self.db_manager.add_articles_bulk([old_article, new_article])
+        self.db_manager.set_scraped_date([old_article.id], datetime.now() - timedelta(days=35))
         
         deleted_count = self.db_manager.cleanup_old_articles(retention_days=30)
         
@@ -197,21 +277,223 @@ class TestDatabaseManager:
         
         self.db_manager.add_article(article)
         assert self.db_manager.get_article_count() == 1
+        
+        self.db_manager.add_article(article)
+        assert self.db_manager.get_article_count() == 1
+        
+        self.db_manager.cleanup_old_articles(retention_days=-1)
+        assert self.db_manager.get_article_count() == 0
     
-    def test_get_sentiment_distribution(self):
+    def test_source_daily_stats(self):
         articles = [
-            Article(title="Positive", content="Good news", url="https://example.com/1", 
-                   source="Test", sentiment_label="positive"),
-            Article(title="Negative", content="Bad news", url="https://example.com/2", 
-                   source="Test", sentiment_label="negative"),
-            Article(title="Positive2", content="More good news", url="https://example.com/3", 
-                   source="Test", sentiment_label="positive"),
+            Article(title="First", content="Content", url="https://example.com/1",
+                   source="Source A", sentiment_score=0.5),
+            Article(title="Second", content="Content", url="https://example.com/2",
+                   source="Source A"),
+            Article(title="Third", content="Content", url="https://example.com/3",
+                   source="Source B", sentiment_score=-0.2),
         ]
         
-        for article in articles:
-            self.db_manager.add_article(article)
+        self.db_manager.add_articles_bulk(articles)
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            old_date = datetime.now() - timedelta(days=35)
+            cursor.execute("UPDATE articles SET scraped_date = ? WHERE title = ?", (old_date, "Third"))
+            conn.commit()
         
+        self.db_manager.cleanup_old_articles(retention_days=30)
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT source, article_count, sentiment_count, sentiment_total FROM source_daily_stats"
+            )
+            rows = [tuple(row) for row in cursor.fetchall()]
+        
+        assert rows == [("Source A", 2, 1, 0.5)]
+    
+    def test_get_data_version(self):
+        empty_version = self.db_manager.get_data_version()
+        
+        self.db_manager.add_article(Article(title="Test", content="Content", url="https://example.com/1", source="Test"))
+        added_version = self.db_manager.get_data_version()
+        
+        self.db_manager.cleanup_old_articles(retention_days=-1)
+        
+        assert added_version != empty_version
+        assert self.db_manager.get_data_version() != added_version
+
+@pytest.fixture(scope="module")
+def seeded_db():
+    """One database seeded in a single bulk insert, for tests that only read"""
+    db_manager = DatabaseManager(":memory:")
+    db_manager.add_articles_bulk([
+        Article(
+            title="Machine Learning Article",
+            content="This article discusses machine learning algorithms.",
+            url="https://example.com/ml",
+            source="Test Source",
+            published_date=datetime(2024, 1, 15, 10, 30),
+            sentiment_score=0.6,
+            sentiment_label="positive"
+        ),
+        Article(
+            title="Python Packaging Guide",
+            content="Python wheels, Python environments and Python tooling.",
+            url="https://example.com/packaging",
+            source="Test Source",
+            sentiment_score=0.4,
+            sentiment_label="positive"
+        ),
+        Article(
+            title="Weekly Roundup",
+            content="Markets rallied, a storm hit the coast, elections were called "
+                    "and a new Python release shipped among other news this week.",
+            url="https://example.com/roundup",
+            source="Other Source",
+            sentiment_score=-0.3,
+            sentiment_label="negative"
+        ),
+        Article(
+            title="Unlabelled",
+            content="Plain update.",
+            url="https://example.com/unlabelled",
+            source="Other Source"
+        ),
+    ])
+    yield db_manager
+    db_manager.close()
+
+class TestDatabaseQueries:
+    """Read-only queries against the shared seeded database; nothing here may write"""
+    
+    @pytest.fixture(autouse=True)
+    def _use_seeded_db(self, seeded_db):
+        self.db_manager = seeded_db
+    
+    def test_get_articles_raw_matches_get_articles(self):
+        articles = {article.id: article for article in self.db_manager.get_articles()}
+        raw_articles = self.db_manager.get_articles_raw()
+        
+        assert len(raw_articles) == len(articles) == 4
+        for raw in raw_articles:
+            article = articles[raw["id"]]
+            assert raw["title"] == article.title
+            assert raw["published_date"] == (article.published_date and article.published_date.isoformat())
+            assert raw["scraped_date"] == article.scraped_date.isoformat()
+            assert "content" not in raw
+        
+        results = self.db_manager.search_articles_raw("machine")
+        assert results[0]["published_date"] == "2024-01-15T10:30:00"
+    
+    def test_search_articles(self):
+        ml_results = self.db_manager.search_articles("machine learning")
+        packaging_results = self.db_manager.search_articles("Packaging")
+        
+        assert [a.title for a in ml_results] == ["Machine Learning Article"]
+        assert [a.title for a in packaging_results] == ["Python Packaging Guide"]
+        assert self.db_manager.search_articles("cooking") == []
+    
+    def test_search_orders_by_bm25(self):
+        # The roundup only mentions the term once, so it ranks second
+        results = self.db_manager.search_articles("python")
+        assert [a.title for a in results] == ["Python Packaging Guide", "Weekly Roundup"]
+    
+    def test_get_sentiment_distribution(self):
         distribution = self.db_manager.get_sentiment_distribution()
         
         assert distribution["positive"] == 2
-        assert distribution["negative"] == 1
\ No newline at end of file
+        assert distribution["negative"] == 1
+    
+    def test_get_sentiment_summary(self):
+        distribution, total_articles = self.db_manager.get_sentiment_summary()
+        
+        assert distribution == self.db_manager.get_sentiment_distribution()
+        assert total_articles == self.db_manager.get_article_count() == 4
+
+class TestDatabaseManagerOnDisk:
+    def setup_method(self):
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db_manager = DatabaseManager(self.temp_db.name)
+    
+    def teardown_method(self):
+        self.db_manager.close()
+        os.unlink(self.temp_db.name)
+    
+    def test_journal_mode(self):
+        with self.db_manager.get_connection() as conn:
+            assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    
+    def test_concurrent_bulk_inserts_count_only_their_own_rows(self):
+        self.db_manager.add_source(Source(name="Test Source", base_url="https://example.com"))
+        
+        def insert_batch(worker):
+            self.db_manager.add_articles_bulk([
+                Article(title=f"Article {worker}-{i}", content="Content",
+                        url=f"https://example.com/{worker}/{i}", source="Test Source")
+                for i in range(500)
+            ])
+        
+        threads = [threading.Thread(target=insert_batch, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        source = self.db_manager.get_sources()[0]
+        assert self.db_manager.get_article_count() == 2000
+        assert (source.success_count, source.error_count) == (2000, 0)
+    
+    def test_connections_close_when_their_thread_exits(self):
+        opened = []
+        
+        def use_connection():
+            with self.db_manager.get_connection() as conn:
+                conn.execute('SELECT COUNT(*) FROM articles').fetchone()
+                opened.append(conn)
+        
+        for _ in range(20):
+            thread = threading.Thread(target=use_connection)
+            thread.start()
+            thread.join()
+        
+        assert len(self.db_manager._connections) == 1
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute('SELECT 1')
+    
+    def test_source_daily_stats_backfill(self):
+        self.db_manager.add_article(Article(
+            title="Test Article", content="Content", url="https://example.com/1",
+            source="Source A", sentiment_score=0.5
+        ))
+        
+        with self.db_manager.get_connection() as conn:
+            conn.execute("DROP TABLE source_daily_stats")
+            conn.commit()
+        
+        db_manager = DatabaseManager(self.temp_db.name)
+        with db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT source, article_count, sentiment_total FROM source_daily_stats")
+            rows = [tuple(row) for row in cursor.fetchall()]
+        
+        db_manager.close()
+        
+        assert rows == [("Source A", 1, 0.5)]
+    
+    def test_article_count_backfill(self):
+        self.db_manager.add_article(Article(
+            title="Test Article", content="Content", url="https://example.com/1",
+            source="Source A"
+        ))
+        
+        with self.db_manager.get_connection() as conn:
+            conn.execute("DROP TABLE table_counts")
+            conn.commit()
+        
+        db_manager = DatabaseManager(self.temp_db.name)
+        assert db_manager.get_article_count() == 1
+        db_manager.close()
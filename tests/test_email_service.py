@@ -0,0 +1,48 @@
+import pytest
+import asyncio
+import time
+from unittest.mock import Mock, AsyncMock, patch
+
+from src.utils.email_service import EmailNotificationService, EmailConfig, EmailRecipient
+
+@pytest.fixture
+def email_service():
+    config = EmailConfig(
+        smtp_server="smtp.example.com",
+        smtp_port=587,
+        username="user",
+        password="secret",
+        from_email="digest@example.com",
+        from_name="Daily Digest"
+    )
+    service = EmailNotificationService(config, Mock())
+    service._update_email_job = Mock()
+    return service
+
+class TestEmailNotificationService:
+    @pytest.mark.asyncio
+    async def test_trending_job_does_not_block_the_loop(self, email_service):
+        def slow_summary(hours_back):
+            time.sleep(0.3)
+            return {'has_trends': False, 'total_topics': 0}
+        
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+        
+        email_service.trending_analyzer.get_trending_summary = slow_summary
+        result = {'success': True, 'sent_count': 1}
+        with patch.object(email_service, '_render_trending_email', return_value="<p></p>"), \
+                patch.object(email_service, '_generate_text_version', return_value=""), \
+                patch.object(email_service, '_send_bulk_emails', AsyncMock(return_value=result)):
+            ticking = asyncio.create_task(ticker())
+            await email_service.run_trending_topics_job(1, [EmailRecipient(email="reader@example.com")])
+            ticking.cancel()
+        
+        # The loop kept running while the summary was computed
+        assert ticks > 10
+        email_service._update_email_job.assert_called_with(1, 'completed', result)
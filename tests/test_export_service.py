@@ -0,0 +1,154 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.storage.models import Article
+from src.utils.export_service import CSVExportService, ExportOptions
+
+class TestCSVExportService:
+    @pytest.fixture(autouse=True)
+    def _use_clean_db(self, clean_db):
+        self.db_manager = clean_db
+        self.export_service = CSVExportService(self.db_manager)
+    
+    def _add_articles(self, count, start=0):
+        self.db_manager.add_articles_bulk([Article(
+            title=f"Article {i}",
+            content=f"Content for article {i}.",
+            url=f"https://example.com/{i}",
+            source="Test Source" if i % 2 else "Other Source",
+            published_date=datetime(2024, 1, 15, 10, 30),
+            sentiment_score=0.5,
+            sentiment_label="positive"
+        ) for i in range(start, start + count)])
+    
+    def test_get_export_stats(self):
+        self._add_articles(3)
+        
+        stats = self.export_service.get_export_stats()
+        
+        assert stats['total_articles'] == 3
+        assert sorted(stats['sources']) == ["Other Source", "Test Source"]
+        assert stats['date_range']['earliest'] is not None
+        assert stats['recent_articles_7_days'] == 3
+    
+    def test_get_export_stats_cache_invalidation(self):
+        self._add_articles(2)
+        
+        first = self.export_service.get_export_stats()
+        assert self.export_service.get_export_stats() is first
+        
+        self._add_articles(1, start=2)
+        assert self.export_service.get_export_stats()['total_articles'] == 3
+        
+        self.db_manager.cleanup_old_articles(retention_days=-1)
+        assert self.export_service.get_export_stats()['total_articles'] == 0
+    
+    def test_get_export_stats_cache_hit_skips_readonly_connection(self):
+        self._add_articles(2)
+        first = self.export_service.get_export_stats()
+        
+        with patch.object(self.db_manager, 'get_readonly_connection') as readonly:
+            assert self.export_service.get_export_stats() is first
+        readonly.assert_not_called()
+    
+    def test_export_articles(self):
+        self._add_articles(3)
+        
+        csv_content = self.export_service.export_articles()
+        lines = csv_content.strip().splitlines()
+        
+        assert lines[0].startswith('id,title,source,url')
+        assert len(lines) == 4
+        assert 'Article 2' in lines[1]
+        assert '2024-01-15 10:30:00' in lines[1]
+    
+    def test_export_articles_serial_matches_prefetch(self):
+        self._add_articles(5)
+        self.export_service.EXPORT_BATCH_SIZE = 2
+        
+        prefetched = self.export_service.export_articles(ExportOptions(include_content=True))
+        serial = self.export_service.export_articles(ExportOptions(include_content=True, max_records=10))
+        
+        assert serial == prefetched
+        assert len(serial.strip().splitlines()) == 6
+    
+    def test_iter_export_articles_yields_per_batch(self):
+        self._add_articles(5)
+        self.export_service.EXPORT_BATCH_SIZE = 2
+        
+        chunks = list(self.export_service.iter_export_articles(ExportOptions(max_records=10)))
+        
+        assert len(chunks) == 3
+        assert chunks[0].startswith('id,title,source,url')
+        assert ''.join(chunks) == self.export_service.export_articles(ExportOptions(max_records=10))
+    
+    def test_export_articles_fast_matches_csv_writer(self):
+        self._add_articles(3)
+        self.db_manager.add_article(Article(
+            title='Comma, "quotes" and\nnewlines',
+            content="Tricky content.",
+            url="https://example.com/tricky?a=1,2",
+            source="Test Source",
+            author="Smith, J."
+        ))
+        
+        standard = self.export_service.export_articles(ExportOptions())
+        fast = self.export_service.export_articles(ExportOptions(fast=True))
+        
+        assert fast == standard
+    
+    def test_export_analytics_summary(self):
+        self._add_articles(3)
+        self.db_manager.add_article(Article(
+            title="Negative Article",
+            content="Bad news.",
+            url="https://example.com/negative",
+            source="Test Source",
+            sentiment_score=-0.5,
+            sentiment_label="negative"
+        ))
+        
+        csv_content = self.export_service.export_analytics_summary(days_back=7)
+        
+        assert 'Positive,3,75.0%' in csv_content
+        assert 'Negative,1,25.0%' in csv_content
+        assert 'Other Source,2,0.500' in csv_content
+        assert 'Test Source,2,0.000' in csv_content
+    
+    def test_export_trending_topics(self):
+        for i in range(3):
+            self.db_manager.add_article(Article(
+                title=f"Quantum processor milestone {i}",
+                content="Researchers unveiled a quantum processor. " * 30,
+                url=f"https://example.com/quantum/{i}",
+                source="Test Source",
+                sentiment_score=0.4,
+                sentiment_label="positive"
+            ))
+        
+        csv_content = self.export_service.export_trending_topics(hours_back=48)
+        lines = csv_content.strip().splitlines()
+        quantum_row = next(line for line in lines if line.startswith('quantum,'))
+        
+        assert lines[0].startswith('keyword,frequency,articles_count')
+        assert ',3,0.400,Positive,' in quantum_row
+        assert quantum_row.endswith('Quantum processor milestone 2,Quantum processor milestone 1,Quantum processor milestone 0')
+    
+    def test_export_articles_filters(self):
+        self._add_articles(6)
+        
+        csv_content = self.export_service.export_articles(ExportOptions(
+            source_filter="Test Source",
+            sentiment_filter="positive",
+            max_records=2
+        ))
+        lines = csv_content.strip().splitlines()
+        
+        assert len(lines) == 3
+        assert all('Test Source' in line for line in lines[1:])
+    
+    def test_export_articles_empty(self):
+        csv_content = self.export_service.export_articles(ExportOptions(source_filter="Missing"))
+        
+        assert 'No data available' in csv_content
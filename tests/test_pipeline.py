@@ -0,0 +1,85 @@
+import pytest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock, patch
+
+from src.processor import pipeline
+from src.processor.pipeline import Processors, process_articles, process_batch
+from src.storage.models import Article
+
+def _summarize(text, max_sentences=None):
+    if "broken" in text:
+        raise ValueError("cannot summarize")
+    return f"summary of {text}"
+
+@pytest.fixture
+def processors():
+    sentiment_analyzer = Mock()
+    sentiment_analyzer.analyze_sentiment_simple.return_value = (0.5, "positive")
+    sentiment_analyzer.batch_analyze_sentiment_simple.side_effect = lambda texts: [(0.5, "positive")] * len(texts)
+    
+    summarizer = Mock()
+    summarizer.summarize.side_effect = _summarize
+    summarizer.batch_summarize.side_effect = lambda texts, max_sentences=None: [_summarize(text) for text in texts]
+    
+    content_extractor = Mock()
+    content_extractor.is_quality_content.return_value = True
+    content_extractor.extract_keywords.return_value = "news"
+    
+    processors = Processors(sentiment_analyzer, summarizer, content_extractor)
+    with patch('src.processor.pipeline.get_processors', return_value=processors):
+        yield processors
+
+def _articles(contents):
+    return [
+        Article(title=f"Article {i}", content=content, url=f"https://example.com/{i}", source="Test Source")
+        for i, content in enumerate(contents)
+    ]
+
+class TestPipeline:
+    def test_process_batch_fills_in_articles(self, processors):
+        processed = process_batch(_articles(["first", "second"]))
+        
+        assert [article.summary for article in processed] == ["summary of first", "summary of second"]
+        assert all(article.sentiment_label == "positive" for article in processed)
+        assert all(article.keywords == "news" for article in processed)
+    
+    def test_process_batch_drops_only_the_failing_article(self, processors):
+        processed = process_batch(_articles(["first", "broken", "third"]))
+        
+        assert [article.title for article in processed] == ["Article 0", "Article 2"]
+        assert processed[1].summary == "summary of third"
+    
+    def test_process_batch_drops_article_when_keywords_fail(self, processors):
+        processors.content_extractor.extract_keywords.side_effect = ["news", RuntimeError("boom"), "news"]
+        
+        processed = process_batch(_articles(["first", "second", "third"]))
+        
+        assert [article.title for article in processed] == ["Article 0", "Article 2"]
+    
+    def test_process_articles_redoes_batches_of_a_broken_pool(self, processors):
+        class BrokenPool:
+            def __init__(self, max_workers=None, mp_context=None):
+                self.start_method = mp_context.get_start_method()
+                pools.append(self)
+            
+            def __enter__(self):
+                return self
+            
+            def __exit__(self, *exc_info):
+                return False
+            
+            def submit(self, fn, batch):
+                future = Future()
+                future.set_exception(BrokenProcessPool("worker died"))
+                return future
+        
+        pools = []
+        articles = _articles([f"article {i}" for i in range(pipeline.PARALLEL_PROCESS_MIN_ARTICLES)])
+        with patch('src.processor.pipeline.ProcessPoolExecutor', BrokenPool):
+            processed = process_articles(articles)
+        
+        assert len(processed) == len(articles)
+        # Never fork the multithreaded server process
+        assert len(pools) == 1
+        assert pools[0].start_method != "fork"
@@ -1,11 +1,27 @@
 import pytest
+from unittest.mock import patch
 from src.processor.text_processor import TextProcessor
 from src.processor.sentiment_analyzer import SentimentAnalyzer
 from src.processor.summarizer import TextSummarizer
 
+# The processors hold no per-call state, so one of each (and one load of
+# the NLTK data behind them) serves every test
+@pytest.fixture(scope="session")
+def text_processor():
+    return TextProcessor()
+
+@pytest.fixture(scope="session")
+def sentiment_analyzer():
+    return SentimentAnalyzer()
+
+@pytest.fixture(scope="session")
+def text_summarizer():
+    return TextSummarizer(summary_sentences=2)
+
 class TestTextProcessor:
-    def setup_method(self):
-        self.processor = TextProcessor()
+    @pytest.fixture(autouse=True)
+    def _use_processor(self, text_processor):
+        self.processor = text_processor
     
     def test_clean_text(self):
         text = "<p>This is a test</p>\n\nwith HTML tags and   extra   spaces."
@@ -83,8 +99,9 @@ class TestTextProcessor:
         assert similarity_high > similarity_low
 
 class TestSentimentAnalyzer:
-    def setup_method(self):
-        self.analyzer = SentimentAnalyzer()
+    @pytest.fixture(autouse=True)
+    def _use_analyzer(self, sentiment_analyzer):
+        self.analyzer = sentiment_analyzer
     
     def test_analyze_sentiment_positive(self):
         positive_text = "This is wonderful news! I'm so happy and excited about this amazing development."
@@ -124,20 +141,28 @@ class TestSentimentAnalyzer:
         assert label in ["positive", "negative", "neutral"]
     
     def test_batch_analyze_sentiment(self):
-        texts = [
-            "Great news!",
-            "Terrible situation.",
-            "Regular update."
-        ]
-        results = self.analyzer.batch_analyze_sentiment(texts)
+        texts = ["Great news!"] * 32 + ["Terrible situation."] * 32
+        
+        with patch.object(self.analyzer, 'analyze_sentiment', wraps=self.analyzer.analyze_sentiment) as analyze:
+            results = self.analyzer.batch_analyze_sentiment(texts)
         
         assert isinstance(results, list)
-        assert len(results) == 3
+        assert len(results) == 64
         assert all("score" in result and "label" in result for result in results)
+        assert analyze.call_count == 2
+        assert [result['label'] for result in results] == ["positive"] * 32 + ["negative"] * 32
+        assert results[0] is not results[1]
+    
+    def test_batch_analyze_sentiment_simple(self):
+        texts = ["Great news!", "Terrible situation."]
+        results = self.analyzer.batch_analyze_sentiment_simple(texts)
+        
+        assert results == [self.analyzer.analyze_sentiment_simple(text) for text in texts]
 
 class TestTextSummarizer:
-    def setup_method(self):
-        self.summarizer = TextSummarizer(summary_sentences=2)
+    @pytest.fixture(autouse=True)
+    def _use_summarizer(self, text_summarizer):
+        self.summarizer = text_summarizer
     
     def test_summarize_short_text(self):
         short_text = "This is a short text. It only has two sentences."
@@ -1,12 +1,42 @@
 import pytest
-from unittest.mock import Mock, patch
+import requests
+from unittest.mock import patch
 from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from src.scraper.base_scraper import BaseScraper
 from src.scraper.content_extractor import ContentExtractor
 from src.storage.models import Article
 
+class CannedAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter serving registered pages, so requests' own Session code still runs"""
+    
+    def __init__(self):
+        super().__init__()
+        self.pages = {}
+    
+    def add(self, url, body, status=200):
+        self.pages[url] = (status, body)
+    
+    def send(self, request, **kwargs):
+        if request.url not in self.pages:
+            raise requests.ConnectionError(f"No page registered for {request.url}")
+        
+        status, body = self.pages[request.url]
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.url = request.url
+        response.request = request
+        return response
+    
+    def close(self):
+        pass
+
+@pytest.fixture(scope="module")
+def http_mock():
+    return CannedAdapter()
+
 class TestBaseScraper:
     def setup_method(self):
         self.source_config = {
@@ -37,25 +67,22 @@ class TestBaseScraper:
         assert self.scraper.rate_limit == 1
         assert self.scraper.max_articles == 5
     
-    @patch('src.scraper.base_scraper.requests.Session.get')
-    def test_fetch_page_success(self, mock_get):
-        mock_response = Mock()
-        mock_response.content = b'<html><body>Test content</body></html>'
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+    def test_fetch_page_success(self, http_mock):
+        http_mock.add('https://example.com/test', b'<html><body>Test content</body></html>')
+        self.scraper.session.mount('https://', http_mock)
         
         soup = self.scraper.fetch_page('https://example.com/test')
         
         assert soup is not None
         assert soup.find('body').text == 'Test content'
     
-    @patch('src.scraper.base_scraper.requests.Session.get')
-    def test_fetch_page_failure(self, mock_get):
-        mock_get.side_effect = Exception("Network error")
+    @patch('src.scraper.base_scraper.time.sleep')
+    def test_fetch_page_failure(self, mock_sleep, http_mock):
+        http_mock.add('https://example.com/missing', b'Not found', status=404)
+        self.scraper.session.mount('https://', http_mock)
         
-        soup = self.scraper.fetch_page('https://example.com/test')
-        
-        assert soup is None
+        assert self.scraper.fetch_page('https://example.com/missing') is None
+        assert self.scraper.fetch_page('https://example.com/unreachable') is None
     
     def test_extract_article_links(self):
         html = '''
@@ -67,7 +94,7 @@ class TestBaseScraper:
             </body>
         </html>
         '''
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         
         links = self.scraper.extract_article_links(soup)
         
@@ -83,12 +110,19 @@ class TestBaseScraper:
     
     def test_extract_title(self):
         html = '<html><body><h1>Test Article Title</h1></body></html>'
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         
         title = self.scraper._extract_title(soup)
         
         assert title == 'Test Article Title'
     
+    def test_invalid_selector_falls_back_to_default(self):
+        self.source_config['selectors']['title'] = 'h1['
+        scraper = BaseScraper(self.source_config, self.scraping_config)
+        soup = BeautifulSoup('<html><body><h1>Test Article Title</h1></body></html>', 'lxml')
+        
+        assert scraper._extract_title(soup) == 'Test Article Title'
+    
     def test_extract_content(self):
         html = '''
         <html>
@@ -100,7 +134,7 @@ class TestBaseScraper:
             </body>
         </html>
         '''
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         
         content = self.scraper._extract_content(soup)
         
@@ -121,6 +155,15 @@ class TestBaseScraper:
         assert parsed_date.year == 2024
         assert parsed_date.month == 1
         assert parsed_date.day == 15
+        assert parsed_date.utcoffset().total_seconds() == 0
+    
+    def test_parse_date_formats(self):
+        assert self.scraper._parse_date("2024-01-15T10:30:00.250+02:00") == datetime(
+            2024, 1, 15, 10, 30, 0, 250000, tzinfo=timezone(timedelta(hours=2))
+        )
+        assert self.scraper._parse_date("2024-01-15") == datetime(2024, 1, 15)
+        assert self.scraper._parse_date("15 January 2024") == datetime(2024, 1, 15)
+        assert self.scraper._parse_date("last Tuesday") is None
 
 class TestContentExtractor:
     def setup_method(self):
@@ -158,4 +201,11 @@ class TestContentExtractor:
         
         duplicates = self.extractor.detect_duplicates(articles)
         
-        assert isinstance(duplicates, list)
\ No newline at end of file
+        assert isinstance(duplicates, list)
+    
+    def test_detect_duplicates_groups_near_copies(self):
+        rates = "Central bank raises interest rates to curb persistent inflation across the eurozone economy"
+        football = "Local football club wins championship after dramatic penalty shootout in the final"
+        articles = [rates, football, rates + " on Thursday", "Storm closes schools across the region", rates]
+        
+        assert self.extractor.detect_duplicates(articles) == [{0, 2, 4}]